@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+import argparse
+import fnmatch
+import importlib
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+
+def _vsphere_mode():
+    try:
+        return importlib.import_module("vmdk2kvm.vmware.vsphere_mode")
+    except Exception as e:
+        pytest.skip(f"Cannot import vsphere_mode: {e}")
+
+
+def test_compile_globs_matches_like_fnmatch():
+    gc = pytest.importorskip("vmdk2kvm.vmware.govc_common")
+    pats = ["*.vmdk", "*.nvram", "vm/*.log"]
+    rx = gc.compile_globs(pats)
+    for name in ["a.vmdk", "x.nvram", "vm/a.log", "a.log", "a.vmdk.bak", "vm/disk-flat.vmdk"]:
+        assert bool(rx.match(name)) == any(fnmatch.fnmatch(name, p) for p in pats), name
+    assert gc.compile_globs([]) is None
+
+
+def test_coalesce_extents_merges_small_gaps():
+    vm = _vsphere_mode()
+    areas = [SimpleNamespace(start=s, length=l) for s, l in [(8192, 4096), (0, 4096), (1 << 20, 512)]]
+    groups = vm._coalesce_extents(areas, gap=4096)
+    assert groups == [
+        (0, 12288, [(0, 4096), (8192, 4096)]),
+        (1 << 20, 512, [(1 << 20, 512)]),
+    ]
+    assert len(vm._coalesce_extents(areas, gap=0)) == 3
+    empty = [SimpleNamespace(start=4096, length=0), SimpleNamespace(start=0, length=512)]
+    assert vm._coalesce_extents(empty) == [(0, 512, [(0, 512)])]
+
+
+def test_batch_groups_caps_ranges_and_bytes():
+    vm = _vsphere_mode()
+    groups = [(i * 100, 10, [(i * 100, 10)]) for i in range(5)]
+    assert [len(b) for b in vm._batch_groups(groups, per=2)] == [2, 2, 1]
+    assert [len(b) for b in vm._batch_groups(groups, per=10, max_bytes=25)] == [2, 2, 1]
+    big = [(0, 100, [(0, 100)]), (200, 10, [(200, 10)])]
+    assert [len(b) for b in vm._batch_groups(big, per=10, max_bytes=50)] == [1, 1]
+
+
+def test_parse_content_range():
+    vm = _vsphere_mode()
+    assert vm._parse_content_range("bytes 100-199/1000") == (100, 199)
+    assert vm._parse_content_range("bytes 0-0/*") == (0, 0)
+    with pytest.raises(vm.VMwareError) as ei:
+        vm._parse_content_range("items 1-2/3")
+    assert ei.value.msg == "bad Content-Range: 'items 1-2/3'"
+
+
+def test_ls_results_paths_joins_subfolders():
+    vm = _vsphere_mode()
+    data = [
+        {"folderPath": "[ds1] vm/", "file": [{"path": "a.vmdk"}, {"path": "logs"}]},
+        {"folderPath": "[ds1] vm/logs/", "file": [{"path": "vmware.log"}]},
+    ]
+    assert vm._ls_results_paths(data) == ["vm/a.vmdk", "vm/logs/vmware.log"]
+
+
+def test_pyvmomi_recursive_listing_skips_subfolders():
+    vm = _vsphere_mode()
+    dsb = vm.vim.host.DatastoreBrowser
+    result = [
+        dsb.SearchResults(
+            folderPath="[ds1] vm/",
+            file=[vm.vim.FolderFileInfo(path="logs"), vm.vim.FileInfo(path="a.vmdk"), vm.vim.FileInfo(path="snap")],
+        ),
+        dsb.SearchResults(folderPath="[ds1] vm/logs/", file=[vm.vim.FileInfo(path="vmware.log")]),
+        dsb.SearchResults(folderPath="[ds1] vm/snap", file=[]),
+    ]
+    browser = SimpleNamespace(
+        SearchDatastoreSubFolders_Task=lambda datastorePath, searchSpec: SimpleNamespace(
+            info=SimpleNamespace(result=result)
+        )
+    )
+    client = SimpleNamespace(wait_for_task=lambda task: None)
+    mode = vm.VsphereMode(logging.getLogger("test"), argparse.Namespace())
+    files = mode._list_vm_folder_files_pyvmomi(
+        client, SimpleNamespace(browser=browser), "ds1", "vm", [], [], 0, recursive=True
+    )
+    assert files == ["vm/a.vmdk", "vm/logs/vmware.log"]
+
+
+def test_retrieve_all_follows_token_and_drops_deleted():
+    vm = _vsphere_mode()
+    gone = SimpleNamespace(obj="vm-2", missingSet=[SimpleNamespace(fault=vm.vmodl.fault.ManagedObjectNotFound())])
+    pages = {
+        None: SimpleNamespace(objects=[SimpleNamespace(obj="vm-0"), SimpleNamespace(obj="vm-1")], token="t1"),
+        "t1": SimpleNamespace(objects=[gone, SimpleNamespace(obj="vm-3")], token=None),
+    }
+    pc = SimpleNamespace(
+        RetrievePropertiesEx=lambda specs, opts: pages[None],
+        ContinueRetrievePropertiesEx=lambda token: pages[token],
+    )
+    assert [oc.obj for oc in vm._retrieve_all(pc, None, page_size=2)] == ["vm-0", "vm-1", "vm-3"]
+
+
+def test_resolve_chunk_size_order(monkeypatch):
+    vm = _vsphere_mode()
+    monkeypatch.delenv("VMDK2KVM_VSPHERE_CHUNK_SIZE", raising=False)
+    args = SimpleNamespace(chunk_size=None, vs_chunk_size=None)
+    assert vm.resolve_chunk_size(args) == vm.DEFAULT_CHUNK_SIZE
+    assert vm.resolve_chunk_size(args, vm.DISK_CHUNK_SIZE) == vm.DISK_CHUNK_SIZE
+    monkeypatch.setenv("VMDK2KVM_VSPHERE_CHUNK_SIZE", "65536")
+    assert vm.resolve_chunk_size(args) == 65536
+    args.vs_chunk_size = 8192
+    assert vm.resolve_chunk_size(args) == 8192
+    args.chunk_size = 4096
+    assert vm.resolve_chunk_size(args) == 4096
+    assert vm.resolve_chunk_size(SimpleNamespace(chunk_size="x")) == vm.DEFAULT_CHUNK_SIZE
+
+
+def test_parse_retry_after():
+    vm = _vsphere_mode()
+    assert vm._parse_retry_after(b" 7\r\n") == 7.0
+    assert vm._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert vm._parse_retry_after("soon") is None
+    assert vm._parse_retry_after(None) is None
+
+
+def test_folder_download_resumes_after_chunked_encoding_error(tmp_path, monkeypatch):
+    vm = _vsphere_mode()
+    requests = pytest.importorskip("requests")
+    data = bytes(range(200)) * 50
+    cut = 3000
+    sent = []
+
+    class _Raw:
+        def __init__(self, body, fail):
+            self.body, self.fail, self.pos = body, fail, 0
+
+        def read(self, n=-1):
+            if self.fail and self.pos >= len(self.body):
+                raise requests.exceptions.ChunkedEncodingError("connection broken mid-body")
+            chunk = self.body[self.pos:self.pos + n]
+            self.pos += len(chunk)
+            return chunk
+
+    class _Resp:
+        def __init__(self, status, headers, raw):
+            self.status_code, self.headers, self.raw = status, headers, raw
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def get(url, headers=None, **kw):
+        rng = (headers or {}).get("Range")
+        sent.append(rng)
+        if rng is None:
+            return _Resp(200, {"content-length": str(len(data))}, _Raw(data[:cut], fail=True))
+        start = int(rng[len("bytes="):-1])
+        h = {"content-length": str(len(data) - start), "content-range": f"bytes {start}-{len(data) - 1}/{len(data)}"}
+        return _Resp(206, h, _Raw(data[start:], fail=False))
+
+    monkeypatch.setattr(vm._Backoff, "sleep", lambda self, retry_after=None: 0.0)
+    mode = vm.VsphereMode(logging.getLogger("test"), argparse.Namespace(vs_write_behind="0"))
+    monkeypatch.setattr(mode, "_http_session", lambda cookie, retries, verify_tls=True: SimpleNamespace(get=get))
+    out = tmp_path / "disk.vmdk"
+    client = SimpleNamespace(_session_cookie=lambda: "vmware_soap_session=x")
+    mode._download_one_folder_file(client, "vc", "dc", "ds1", "vm/disk.vmdk", out, True, chunk_size=1024)
+    assert sent == [None, f"bytes={cut}-"]
+    assert out.read_bytes() == data
+    assert not (tmp_path / "disk.vmdk.part").exists()
@@ -412,11 +412,24 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p.add_argument("--exclude-glob", dest="vs_exclude_glob", action="append", default=[], help="download-only VM folder: exclude file glob (repeatable).")
     p.add_argument("--concurrency", dest="vs_concurrency", type=int, default=4, help="download-only VM folder: concurrent downloads (default: 4).")
+    p.add_argument("--recursive", dest="vs_recursive", action="store_true", help="download-only VM folder: include subfolders (one govc datastore.ls -R or SearchDatastoreSubFolders_Task).")
     p.add_argument("--max-files", dest="vs_max_files", type=int, default=5000, help="download-only VM folder: refuse to download more than this many files (default: 5000).")
 
-    p.add_argument("--use-async-http", dest="vs_use_async_http", action="store_true", help="download-only VM folder: prefer aiohttp/aiofiles when available.")
-    p.add_argument("--no-use-async-http", dest="vs_use_async_http", action="store_false", help="download-only VM folder: disable aiohttp/aiofiles (force requests).")
-    p.set_defaults(vs_use_async_http=True)
+    # /folder and CBT transfer tuning: unset flags fall back to the VMDK2KVM_VSPHERE_* env var, then the default.
+    p.add_argument("--http-backend", dest="vs_http_backend", choices=["requests", "pycurl"], default=None, help="download-only VM folder: HTTP client for /folder files (default: requests; env VMDK2KVM_VSPHERE_HTTP_BACKEND).")
+    p.add_argument("--http-segments", dest="vs_http_segments", type=int, default=None, help="download-only VM folder: split large files into N parallel Range GETs (default: 1; env VMDK2KVM_VSPHERE_HTTP_SEGMENTS).")
+    p.add_argument("--write-behind", dest="vs_write_behind", action="store_true", default=None, help="download-only VM folder: write to disk on a helper thread while reading the socket (default: on; env VMDK2KVM_VSPHERE_WRITE_BEHIND).")
+    p.add_argument("--no-write-behind", dest="vs_write_behind", action="store_false", help="download-only VM folder: write synchronously from the download thread.")
+    p.add_argument("--resume", dest="vs_resume", action="store_true", default=None, help="download-only VM folder: continue .part files with Range requests and skip complete files (default: on; env VMDK2KVM_VSPHERE_RESUME).")
+    p.add_argument("--no-resume", dest="vs_resume", action="store_false", help="download-only VM folder: always download every file from the start.")
+    p.add_argument("--prealloc", dest="vs_prealloc", action="store_true", default=None, help="download-only VM folder: fallocate() the announced Content-Length (default: on; env VMDK2KVM_VSPHERE_PREALLOC).")
+    p.add_argument("--no-prealloc", dest="vs_prealloc", action="store_false", help="download-only VM folder: do not reserve disk space up front.")
+    p.add_argument("--cbt-merge-gap", dest="vs_cbt_merge_gap", type=int, default=None, help="cbt_sync: read changed extents closer than this many bytes as one range (default: 64KiB; env VMDK2KVM_VSPHERE_CBT_MERGE_GAP).")
+    p.add_argument("--cbt-ranges-per-request", dest="vs_cbt_ranges_per_request", type=int, default=None, help="cbt_sync: ranges per multipart/byteranges GET (default: 64; env VMDK2KVM_VSPHERE_CBT_MULTIRANGE).")
+    p.add_argument("--cbt-prealloc", dest="vs_cbt_prealloc", action="store_true", default=None, help="cbt_sync: fallocate() changed extents before writing (default: on; env VMDK2KVM_VSPHERE_CBT_PREALLOC).")
+    p.add_argument("--no-cbt-prealloc", dest="vs_cbt_prealloc", action="store_false", help="cbt_sync: do not reserve blocks for changed extents.")
+    p.add_argument("--cbt-mmap", dest="vs_cbt_mmap", action="store_true", default=None, help="cbt_sync: write through one shared mmap of the local disk (default: off; env VMDK2KVM_VSPHERE_CBT_MMAP).")
+    p.add_argument("--cbt-write-behind", dest="vs_cbt_write_behind", action="store_true", default=None, help="cbt_sync: queue disk writes to one writer thread (default: off; env VMDK2KVM_VSPHERE_CBT_WRITE_BEHIND).")
 
     p.add_argument("--fail-on-missing", dest="vs_fail_on_missing", action="store_true", help="download-only VM folder: treat any failed/missing download as fatal.")
 
@@ -433,7 +446,7 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--datastore", dest="datastore", default=None, help="Datastore name (download_datastore_file)")
     p.add_argument("--ds_path", dest="ds_path", default=None, help="Datastore path (download_datastore_file)")
     p.add_argument("--local_path", dest="local_path", default=None, help="Local output path (download_*)")
-    p.add_argument("--chunk_size", dest="chunk_size", type=int, default=1024 * 1024, help="Download chunk size bytes (default 1MiB)")
+    p.add_argument("--chunk_size", dest="chunk_size", type=int, default=None, help="Download chunk size bytes (default 16MiB for download_vm_disk, 4MiB otherwise; env VMDK2KVM_VSPHERE_CHUNK_SIZE)")
 
     p.add_argument("--snapshot_name", dest="snapshot_name", default=None, help="Snapshot name (create_snapshot/query_changed_disk_areas/cbt_sync)")
     p.add_argument("--quiesce", dest="quiesce", action="store_true", default=True, help="Quiesce filesystem (create_snapshot)")
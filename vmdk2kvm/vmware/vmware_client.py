@@ -3,7 +3,6 @@
 # vmdk2kvm/vmware/vsphere_client.py
 from __future__ import annotations
 
-import fnmatch
 import hashlib
 import logging
 import os
@@ -14,6 +13,7 @@ import socket
 import ssl
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
@@ -41,13 +41,16 @@ except Exception:  # pragma: no cover
     SELECT_AVAILABLE = False
 
 try:
-    from .govc_common import GovcRunner, extract_paths_from_datastore_ls_json, normalize_ds_path
+    from .govc_common import GovcRunner, compile_globs, extract_paths_from_datastore_ls_json, normalize_ds_path
 except Exception:  # pragma: no cover
     GovcRunner = None  # type: ignore
 
     def normalize_ds_path(datastore: str, ds_path: str) -> Tuple[str, str]:  # type: ignore
         raise RuntimeError("govc_common.normalize_ds_path unavailable")
 
+    def compile_globs(patterns: Sequence[str]) -> Any:  # type: ignore
+        raise RuntimeError("govc_common.compile_globs unavailable")
+
     def extract_paths_from_datastore_ls_json(obj: Any) -> List[str]:  # type: ignore
         return []
 
@@ -95,6 +98,29 @@ except Exception:  # pragma: no cover
     REQUESTS_AVAILABLE = False
 
 
+_HTTP_POOL_MAXSIZE = 16  # keep-alive /folder connections (and download-only workers) per host
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4x fewer write()/progress callbacks per byte than 1MiB
+DISK_CHUNK_SIZE = 16 * 1024 * 1024  # download_vm_disk: multi-GiB VMDKs, fewer syscalls/progress callbacks per byte
+
+
+def resolve_chunk_size(args: Any, default: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Streaming chunk size: --chunk_size, then args.vs_chunk_size / VMDK2KVM_VSPHERE_CHUNK_SIZE,
+    then the caller's default. Invalid or non-positive values fall back to the default.
+    Shared by the vsphere_mode actions and the vsphere_command paths.
+    """
+    v = getattr(args, "chunk_size", None)
+    if not v:
+        v = getattr(args, "vs_chunk_size", None)
+    if not v:
+        v = os.environ.get("VMDK2KVM_VSPHERE_CHUNK_SIZE")
+    try:
+        n = int(v) if v else 0
+    except Exception:
+        n = 0
+    return n if n > 0 else default
+
+
 # Optional: silence urllib3 TLS warnings when verify=False
 try:  # pragma: no cover
     import urllib3  # type: ignore
@@ -179,7 +205,7 @@ class GovmomiCLI(GovcRunner):
         elems = data.get("Elements") or []
         if not isinstance(elems, list):
             elems = []
-        names = [str(p).split("/")[-1] for p in elems if p]
+        names = [str(p).rpartition("/")[2] for p in elems if p]
         return sorted({n for n in names if n})
 
     def datastore_ls(self, datastore: str, ds_dir: str) -> List[str]:
@@ -240,13 +266,15 @@ class GovmomiCLI(GovcRunner):
         rel_dir = rel_dir.rstrip("/") + "/"
         local_dir.mkdir(parents=True, exist_ok=True)
         names = self.datastore_ls_json(ds, rel_dir) if json_listing else self.datastore_ls(ds, rel_dir)
+        inc = compile_globs(include_globs)
+        exc = compile_globs(exclude_globs)
         picked: List[str] = []
         for n in names:
             ok = True
-            if include_globs:
-                ok = any(fnmatch.fnmatch(n, g) for g in include_globs)
-            if ok and exclude_globs:
-                if any(fnmatch.fnmatch(n, g) for g in exclude_globs):
+            if inc is not None:
+                ok = inc.match(n) is not None
+            if ok and exc is not None:
+                if exc.match(n):
                     ok = False
             if ok:
                 picked.append(n)
@@ -336,6 +364,7 @@ class V2VExportOptions:
     )
     download_only_max_files: int = 5000
     download_only_fail_on_missing: bool = False
+    download_only_concurrency: int = 1  # files in flight (threads over one keep-alive session)
 
     # vddk_download options (single-disk raw pull via VDDK client)
     vddk_download_disk: Optional[str] = None  # None or label/index for single, 'all' for all disks
@@ -347,7 +376,7 @@ class V2VExportOptions:
 
 class VMwareClient:
     """
-    Minimal vSphere/vCenter client (SYNC, no threads, no asyncio):
+    Minimal vSphere/vCenter client (SYNC API, no asyncio):
       - pyvmomi control-plane (inventory, compute path, snapshots)
       - HTTPS /folder downloads via session cookie (requests)
       - virt-v2v command builder + runner (sync subprocess)
@@ -379,6 +408,7 @@ class VMwareClient:
         self.si: Any = None
 
         # caches
+        self._service_content: Any = None  # ServiceContent is fixed for the life of a session
         self._dc_cache: Optional[List[Any]] = None
         self._dc_name_cache: Optional[List[str]] = None
         self._host_name_cache: Optional[List[str]] = None
@@ -387,6 +417,9 @@ class VMwareClient:
         self._vm_name_cache: Optional[List[str]] = None
         self._vm_obj_by_name_cache: Dict[str, Any] = {}
 
+        # keep-alive session for /folder downloads (lazy; closed on disconnect)
+        self._http: Any = None
+
         # govc preference (auto if present)
         self.govc_bin = os.environ.get("GOVC_BIN", "govc")
         self.no_govmomi = False
@@ -481,6 +514,7 @@ class VMwareClient:
     def connect(self) -> None:
         self._require_pyvmomi()
         ctx = self._ssl_context()
+        self._service_content = None
         try:
             if self.timeout is not None:
                 old_timeout = socket.getdefaulttimeout()
@@ -527,17 +561,37 @@ class VMwareClient:
             self.logger.error("Error during disconnect: %s", e)
         finally:
             self.si = None
+            self._service_content = None
             self._dc_cache = None
             self._dc_name_cache = None
             self._host_name_cache = None
             self._vm_name_cache = None
             self._vm_obj_by_name_cache = {}
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def _http_session(self) -> Any:
+        """
+        One requests.Session per client so consecutive /folder downloads reuse
+        pooled TCP/TLS connections instead of handshaking per file.
+        """
+        if self._http is None:
+            http = requests.Session()  # type: ignore[union-attr]
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=_HTTP_POOL_MAXSIZE)  # type: ignore[union-attr]
+            http.mount("https://", adapter)
+            http.mount("http://", adapter)
+            self._http = http
+        return self._http
 
     def _content(self) -> Any:
         if not self.si:
             raise VMwareError("Not connected")
+        if self._service_content is not None:
+            return self._service_content
         try:
-            return self.si.RetrieveContent()
+            self._service_content = self.si.RetrieveContent()
+            return self._service_content
         except Exception as e:
             raise VMwareError(f"Failed to retrieve content: {e}")
 
@@ -907,14 +961,36 @@ class VMwareClient:
         if task.info.state == vim.TaskInfo.State.error:  # type: ignore[attr-defined]
             raise VMwareError(str(task.info.error))
 
+    def get_vm_properties(self, vm_obj: Any, paths: Sequence[str]) -> Dict[str, Any]:
+        """
+        Fetch several property paths of a managed object with one PropertyCollector call
+        (instead of one RetrieveProperties round trip per vm_obj.<prop> access).
+        Only the requested subtrees cross the wire; unset properties are absent from the result.
+        """
+        self._require_pyvmomi()
+        PC = vmodl.query.PropertyCollector  # type: ignore[union-attr]
+        spec = PC.FilterSpec(
+            objectSet=[PC.ObjectSpec(obj=vm_obj, skip=False)],
+            propSet=[PC.PropertySpec(type=type(vm_obj), all=False, pathSet=list(paths))],
+        )
+        res = self._content().propertyCollector.RetrievePropertiesEx([spec], PC.RetrieveOptions())
+        out: Dict[str, Any] = {}
+        for oc in getattr(res, "objects", None) or []:
+            for prop in oc.propSet or []:
+                out[prop.name] = prop.val
+        return out
+
+    def _vm_property(self, vm_obj: Any, path: str) -> Any:
+        # e.g. "config.hardware.device" without pulling the whole VirtualMachineConfigInfo
+        return self.get_vm_properties(vm_obj, [path]).get(path)
+
     def vm_disks(self, vm_obj: Any) -> List[Any]:
         self._require_pyvmomi()
-        disks: List[Any] = []
-        devices = getattr(getattr(getattr(vm_obj, "config", None), "hardware", None), "device", []) or []
-        for dev in devices:
-            if isinstance(dev, vim.vm.device.VirtualDisk):  # type: ignore[attr-defined]
-                disks.append(dev)
-        return disks
+        try:
+            devices = self._vm_property(vm_obj, "config.hardware.device") or []
+        except Exception:
+            devices = getattr(getattr(getattr(vm_obj, "config", None), "hardware", None), "device", []) or []
+        return [dev for dev in devices if isinstance(dev, vim.vm.device.VirtualDisk)]  # type: ignore[attr-defined]
 
     def select_disk(self, vm_obj: Any, label_or_index: Optional[str]) -> Any:
         self._require_pyvmomi()
@@ -1065,7 +1141,7 @@ class VMwareClient:
         local_path.parent.mkdir(parents=True, exist_ok=True)
         self.logger.info("Downloading datastore file: [%s] %s (dc=%s) -> %s", datastore, ds_path, dc_use, local_path)
 
-        with requests.get(  # type: ignore[union-attr]
+        with self._http_session().get(
             url,
             headers=headers,
             stream=True,
@@ -1078,17 +1154,24 @@ class VMwareClient:
             tmp = local_path.with_suffix(local_path.suffix + ".part")
             try:
                 with open(tmp, "wb") as f:
+                    if hasattr(os, "posix_fadvise"):
+                        try:
+                            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                        except OSError:  # pragma: no cover
+                            pass
+                    write = f.write
                     for chunk in r.iter_content(chunk_size=chunk_size):
                         if not chunk:
                             continue
-                        f.write(chunk)
-                        got += len(chunk)
+                        write(chunk)
+                        n = len(chunk)
+                        got += n
                         if on_bytes is not None:
                             try:
-                                on_bytes(len(chunk), total)
+                                on_bytes(n, total)
                             except Exception:
                                 pass
-                        if total and got and got % (128 * 1024 * 1024) < chunk_size:
+                        if total and got % (128 * 1024 * 1024) < n:
                             self.logger.info(
                                 "Download progress: %.1f MiB / %.1f MiB (%.1f%%)",
                                 got / (1024**2),
@@ -1097,13 +1180,13 @@ class VMwareClient:
                             )
                 os.replace(tmp, local_path)
             finally:
-                if tmp.exists():
-                    try:
-                        tmp.unlink()
-                    except Exception:
-                        pass
+                # after a successful os.replace() there is nothing left: one unlink(), no stat()
+                try:
+                    tmp.unlink(missing_ok=True)
+                except OSError:
+                    pass
 
-    # download-only mode (NO guest inspection) — SYNC, no concurrency
+    # download-only mode (NO guest inspection) — SYNC; optional per-file thread pool
     def _get_vm_datastore_browser(self, vm_obj: Any) -> Any:
         """
         Returns a DatastoreBrowser for the datastore that contains the VMX (and usually the VM folder).
@@ -1170,10 +1253,6 @@ class VMwareClient:
         files = sorted(set(files))
         return ds_name, folder_rel, files
 
-    @staticmethod
-    def _glob_any(name: str, globs: Sequence[str]) -> bool:
-        return any(fnmatch.fnmatch(name, g) for g in globs) if globs else False
-
     def _filter_download_only_files(
         self,
         files: Sequence[str],
@@ -1182,11 +1261,13 @@ class VMwareClient:
         exclude_globs: Sequence[str],
         max_files: int,
     ) -> List[str]:
+        inc = compile_globs(include_globs)
+        exc = compile_globs(exclude_globs)
         out: List[str] = []
         for f in files:
-            if include_globs and not self._glob_any(f, include_globs):
+            if inc is not None and not inc.match(f):
                 continue
-            if exclude_globs and self._glob_any(f, exclude_globs):
+            if exc is not None and exc.match(f):
                 continue
             out.append(f)
         if max_files and len(out) > int(max_files):
@@ -1199,7 +1280,7 @@ class VMwareClient:
     def download_only_vm(self, opt: V2VExportOptions) -> Path:
         """
         Download-only: NO virt-v2v, NO guest inspection.
-        SYNC behavior (no async, no threads):
+        SYNC behavior (no async; download_only_concurrency > 1 fetches files on a thread pool):
           - Locate VM directory from summary.config.vmPathName (VMX)
           - List files using DatastoreBrowser
           - Download selected files using:
@@ -1233,22 +1314,43 @@ class VMwareClient:
             len(selected),
         )
         failures: List[str] = []
-        for name in selected:
+
+        def _one(name: str) -> None:
             ds_path = f"{folder_rel}/{name}" if folder_rel else name
-            local_path = out_dir / name
-            try:
-                self.download_datastore_file(
-                    datastore=ds_name,
-                    ds_path=ds_path,
-                    local_path=local_path,
-                    dc_name=resolved_dc,
-                )
-            except Exception as e:
-                msg = f"{name}: {e}"
-                failures.append(msg)
-                if opt.download_only_fail_on_missing:
-                    raise VMwareError("Download failed:\n" + "\n".join(failures))
-                self.logger.error("Download failed (non-fatal): %s", msg)
+            self.download_datastore_file(
+                datastore=ds_name,
+                ds_path=ds_path,
+                local_path=out_dir / name,
+                dc_name=resolved_dc,
+            )
+
+        def _failed(name: str, e: Exception) -> None:
+            msg = f"{name}: {e}"
+            failures.append(msg)
+            if opt.download_only_fail_on_missing:
+                raise VMwareError("Download failed:\n" + "\n".join(failures))
+            self.logger.error("Download failed (non-fatal): %s", msg)
+
+        workers = max(1, min(int(opt.download_only_concurrency or 1), _HTTP_POOL_MAXSIZE, len(selected) or 1))
+        if workers == 1:
+            for name in selected:
+                try:
+                    _one(name)
+                except Exception as e:
+                    _failed(name, e)
+        else:
+            # Small files are dominated by per-request latency: keep several in flight.
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vsphere-dl") as ex:
+                futs = {ex.submit(_one, name): name for name in selected}
+                try:
+                    for fut in as_completed(futs):
+                        e = fut.exception()
+                        if e is not None:
+                            _failed(futs[fut], e)  # type: ignore[arg-type]
+                except BaseException:
+                    for f in futs:
+                        f.cancel()
+                    raise
         if failures and opt.download_only_fail_on_missing:
             raise VMwareError("One or more downloads failed:\n" + "\n".join(failures))
         self.logger.info("Download-only completed: %s", out_dir)
@@ -3,7 +3,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import fnmatch
 import os
 import re
 import subprocess
@@ -14,8 +13,8 @@ from urllib.parse import quote
 
 from ..core.exceptions import VMwareError
 from ..core.utils import U
-from .vmware_client import VMwareClient, V2VExportOptions
-from .govc_common import GovcRunner, normalize_ds_path
+from .vmware_client import DISK_CHUNK_SIZE, VMwareClient, V2VExportOptions, resolve_chunk_size
+from .govc_common import GovcRunner, compile_globs, normalize_ds_path
 
 
 def _p(s: Optional[str]) -> Optional[Path]:
@@ -115,7 +114,7 @@ class GovmomiCLI(GovcRunner):
         elems = data.get("Elements") or []
         if not isinstance(elems, list):
             elems = []
-        names = [str(p).split("/")[-1] for p in elems if p]
+        names = [str(p).rpartition("/")[2] for p in elems if p]
         return sorted({n for n in names if n})
 
     def datastore_ls(self, datastore: str, ds_dir: str) -> List[str]:
@@ -174,13 +173,15 @@ class GovmomiCLI(GovcRunner):
 
         names = self.datastore_ls(ds, rel_dir)
 
+        inc = compile_globs(include_globs)
+        exc = compile_globs(exclude_globs)
         picked: List[str] = []
         for n in names:
             ok = True
-            if include_globs:
-                ok = any(fnmatch.fnmatch(n, g) for g in include_globs)
-            if ok and exclude_globs:
-                if any(fnmatch.fnmatch(n, g) for g in exclude_globs):
+            if inc is not None:
+                ok = inc.match(n) is not None
+            if ok and exc is not None:
+                if exc.match(n):
                     ok = False
             if ok:
                 picked.append(n)
@@ -311,7 +312,7 @@ def _download_datastore_file(client: VMwareClient, args: Any) -> Any:
     datastore = _require(args, "datastore")
     ds_path = _require(args, "ds_path")
     local_path = Path(_require(args, "local_path")).expanduser()
-    chunk_size = int(getattr(args, "chunk_size", 1024 * 1024) or 1024 * 1024)
+    chunk_size = resolve_chunk_size(args)
     dc_name = getattr(args, "dc_name", None)
 
     # Prefer govc datastore.download (fewer moving pieces) when available.
@@ -478,7 +479,7 @@ def _download_vm_disk(client: VMwareClient, args: Any) -> Any:
     vm_name = _require(args, "vm_name")
     disk_sel = getattr(args, "disk", None)
     local_path = Path(_require(args, "local_path")).expanduser()
-    chunk_size = int(getattr(args, "chunk_size", 1024 * 1024) or 1024 * 1024)
+    chunk_size = resolve_chunk_size(args, DISK_CHUNK_SIZE)
 
     vm = client.get_vm_by_name(vm_name)
     if vm is None:
@@ -553,7 +554,7 @@ def _cbt_sync(client: VMwareClient, args: Any) -> Any:
             vm_name=vm_name,
             disk=disk_sel,
             local_path=str(local_path),
-            chunk_size=1024 * 1024,
+            chunk_size=resolve_chunk_size(args, DISK_CHUNK_SIZE),
             dc_name=getattr(args, "dc_name", None),
             json=getattr(args, "json", False),
             vcenter=getattr(args, "vcenter", None),
@@ -608,7 +609,6 @@ def _download_only_vm(client: VMwareClient, args: Any) -> Any:
         download_only_exclude_globs=exclude_globs,
         download_only_concurrency=int(getattr(args, "vs_concurrency", 4) or 4),
         download_only_max_files=int(getattr(args, "vs_max_files", 5000) or 5000),
-        download_only_use_async_http=bool(getattr(args, "vs_use_async_http", True)),
         download_only_fail_on_missing=bool(getattr(args, "vs_fail_on_missing", False)),
     )
 
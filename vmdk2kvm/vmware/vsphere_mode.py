@@ -2,17 +2,31 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 import argparse
-import fnmatch
+import errno
+import functools
+import http.client
+import io
 import json
 import logging
+import mmap
 import os
+import queue
+import random
+import re
+import shutil
+import ssl
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pyVmomi import vim, vmodl
 # Optional: Rich progress UI (TTY friendly). Falls back to plain logs if Rich not available.
 try: # pragma: no cover
@@ -27,16 +41,37 @@ try: # pragma: no cover
 except Exception: # pragma: no cover
     Progress = None # type: ignore
     SpinnerColumn = BarColumn = TextColumn = TimeElapsedColumn = TransferSpeedColumn = None # type: ignore
+# Optional: orjson for faster --json output. Falls back to stdlib json.
+try: # pragma: no cover
+    import orjson # type: ignore
+except Exception: # pragma: no cover
+    orjson = None # type: ignore
+# Optional: libcurl transfers for /folder downloads (vs_http_backend=pycurl). Falls back to requests.
+try: # pragma: no cover
+    import pycurl # type: ignore
+except Exception: # pragma: no cover
+    pycurl = None # type: ignore
 # Optional: silence urllib3 TLS warnings when verify=False
 try: # pragma: no cover
     import urllib3 # type: ignore
 except Exception: # pragma: no cover
     urllib3 = None # type: ignore
 from ..core.exceptions import Fatal, VMwareError
-from .vmware_client import REQUESTS_AVAILABLE, VMwareClient
-from .govc_common import GovcRunner, extract_paths_from_datastore_ls_json, normalize_ds_path
+from .vmware_client import DEFAULT_CHUNK_SIZE, DISK_CHUNK_SIZE, REQUESTS_AVAILABLE, VMwareClient, resolve_chunk_size
+from .govc_common import GovcRunner, compile_globs, extract_paths_from_datastore_ls_json, normalize_ds_path
 _DEFAULT_HTTP_TIMEOUT = (10, 300) # (connect, read) seconds
-_DEFAULT_CHUNK_SIZE = 1024 * 1024
+_WRITE_BEHIND_DEPTH = 8 # chunks queued between network reader and disk writer
+_PWRITE_QUEUE_CHUNKS = 2 # CBT write-behind: bytes in flight capped at this many chunk_size buffers per worker
+_IOV_MAX = 1024 # Linux UIO_MAXIOV: buffers per pwritev()
+_CBT_MERGE_GAP = 64 * 1024 # fetch CBT extents this close together with one Range request
+_CBT_MERGE_MAX = 64 * 1024 * 1024 # ...but keep merged requests bounded so workers stay busy
+_CBT_RANGES_PER_REQUEST = 64 # multi-range (multipart/byteranges) batch size for CBT reads
+_CURL_MAX_BUFFER = 10 * 1024 * 1024 # libcurl caps CURLOPT_BUFFERSIZE at 10MiB
+_CURL_RESUMABLE = (7, 18, 28, 52, 55, 56) # connect / partial file / timeout / empty reply / send / recv errors
+_SEGMENT_MIN_SIZE = 64 * 1024 * 1024 # segmented /folder GET: smallest slice worth its own connection
+_HTTP_POOL_MAXSIZE = 16 # keep-alive connections per host in the shared /folder session
+_PC_PAGE_SIZE = 1000 # PropertyCollector objects per RetrievePropertiesEx page
+_PROGRESS_REFRESH_S = 0.1 # download_only_vm byte-bar refresh interval
 def _boolish(v: Any) -> bool:
     if isinstance(v, bool):
         return v
@@ -82,9 +117,675 @@ def _redact_cookie(cookie: str) -> str:
         return f"{k}=…{tail}"
     except Exception:
         return "Cookie=<redacted>"
+_TRANSIENT_HTTP = (408, 429, 500, 502, 503, 504) # classic transient statuses for retries
+_BACKOFF_BASE = 0.2 # seconds; first retry delay floor
+_BACKOFF_CAP = 30.0 # seconds; longest retry delay (also caps a server's Retry-After)
+class _Backoff:
+    """
+    Exponential backoff with decorrelated jitter: each delay is uniform(base, 3 * previous),
+    capped. Retrying clients spread out instead of re-hitting an overloaded vCenter in lockstep.
+    """
+    def __init__(self, base: float = _BACKOFF_BASE, cap: float = _BACKOFF_CAP):
+        self.base = base
+        self.cap = cap
+        self._prev = base
+    def sleep(self, retry_after: Optional[float] = None) -> float:
+        d = min(self.cap, random.uniform(self.base, self._prev * 3))
+        if retry_after is not None:
+            d = min(self.cap, max(d, retry_after))
+        self._prev = d
+        time.sleep(d)
+        return d
+def _parse_retry_after(v: Any) -> Optional[float]:
+    # Retry-After: delta-seconds or an HTTP-date
+    if not v:
+        return None
+    if isinstance(v, bytes):
+        v = v.decode("latin-1")
+    v = str(v).strip()
+    try:
+        return max(0.0, float(v))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(v).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+def _retry_policy(retries: int) -> Retry:
+    # urllib3 Retry for the shared session: honours Retry-After on 413/429/503.
+    kw: Dict[str, Any] = dict(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=_TRANSIENT_HTTP,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=1.0, backoff_max=_BACKOFF_CAP, **kw) # urllib3 >= 2
+    except TypeError: # pragma: no cover - urllib3 1.x: deterministic exponential backoff
+        return Retry(**kw)
+def _pin_environment(session: Any, url: str, verify: Any) -> Any:
+    # With trust_env, requests re-reads proxy env vars and ~/.netrc on every request (~0.5 ms each).
+    # Resolve them once for this URL, then switch the per-request lookup off. Returns the verify
+    # value to pass (REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE still apply when verify is True).
+    settings = session.merge_environment_settings(url, {}, None, verify, None)
+    session.proxies.update(settings.get("proxies") or {})
+    if session.auth is None:
+        session.auth = requests.utils.get_netrc_auth(url)
+    session.trust_env = False
+    return settings.get("verify", verify)
+def _shared_ssl_context(verify_tls: bool) -> Optional[Any]:
+    # One client SSLContext for every pooled connection: urllib3 otherwise builds a new context
+    # and loads the system CA store for each TLS connection (again after every dropped one).
+    # verify=True still gets the CA bundle requests passes per connection.
+    try:
+        from urllib3.util.ssl_ import create_urllib3_context
+        return create_urllib3_context(cert_reqs=ssl.CERT_REQUIRED if verify_tls else ssl.CERT_NONE)
+    except Exception: # pragma: no cover - very old urllib3: fall back to per-connection contexts
+        return None
+class _SharedSSLAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all use the given SSLContext."""
+    def __init__(self, *args: Any, ssl_context: Optional[Any] = None, **kwargs: Any):
+        self._ssl_context = ssl_context # before super().__init__(): it builds the pool manager
+        super().__init__(*args, **kwargs)
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self._ssl_context is not None:
+            kwargs.setdefault("ssl_context", self._ssl_context)
+        super().init_poolmanager(*args, **kwargs)
+_WARNINGS_SILENCED = False
+def _silence_insecure_warnings() -> None:
+    # Once per process: each disable_warnings() call re-inserts a warnings filter and resets
+    # the warnings module's per-call-site caches.
+    global _WARNINGS_SILENCED
+    if _WARNINGS_SILENCED or urllib3 is None: # pragma: no cover
+        return
+    try:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning) # type: ignore[attr-defined]
+    except Exception:
+        pass
+    _WARNINGS_SILENCED = True
 def _is_transient_http(status: int) -> bool:
-    # Classic transient statuses for retries
-    return status in (408, 429, 500, 502, 503, 504)
+    return status in _TRANSIENT_HTTP
+def _dumps(obj: Any, default: Any = str) -> str:
+    # Pretty JSON for --json output. orjson when installed (C encoder); datetimes and
+    # unknown objects still go through str() so the text matches json.dumps(indent=2, default=str).
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode("utf-8")
+        except Exception:
+            pass # e.g. ints beyond 64 bits: let stdlib handle it
+    return json.dumps(obj, indent=2, default=default)
+def _ls_results_paths(data: Any) -> List[str]:
+    # `govc datastore.ls -R -json`: one search result per folder ({folderPath: "[ds] dir/", file: [...]});
+    # join each folder with its entries -> "dir/sub/name" (no leading slash). Subfolders are listed
+    # both as an entry of their parent and as a result of their own; only the files are kept.
+    # Without folderPath the shape is treated like the flat listing.
+    out: List[str] = []
+    dirs = set()
+    for res in (data if isinstance(data, list) else [data]):
+        if not isinstance(res, dict):
+            continue
+        fp = str(res.get("folderPath") or res.get("FolderPath") or "")
+        d = fp.split("]", 1)[1].strip().strip("/") if "]" in fp else fp.strip("/")
+        dirs.add(d)
+        for name in extract_paths_from_datastore_ls_json(res):
+            out.append(f"{d}/{name}" if d else name)
+    return [p for p in dict.fromkeys(out) if p not in dirs]
+def _extent_json(o: Any) -> Any:
+    # JSON default= hook: CBT DiskChangeExtent -> {"start", "length"}, built one at a time while encoding.
+    try:
+        return {"start": o.start, "length": o.length}
+    except AttributeError:
+        return str(o)
+def _folder_url(vc_host: str, dc_name: str, ds_name: str, ds_path: str) -> str:
+    return f"https://{vc_host}/folder/{quote(ds_path, safe='/')}?dcPath={quote(dc_name)}&dsName={quote(ds_name)}"
+def _write_json(obj: Any) -> None:
+    # print(_dumps(obj)) for big listings. orjson encodes in C; the stdlib fallback streams
+    # iterencode() pieces instead of building one large string (its indent=2 encoder is pure Python).
+    if orjson is not None:
+        sys.stdout.write(_dumps(obj))
+    else:
+        sys.stdout.writelines(json.JSONEncoder(indent=2, default=str).iterencode(obj))
+    sys.stdout.write("\n")
+def _disk_info(disk: Any) -> Dict[str, Any]:
+    # getattr(..., default) instead of hasattr() + attribute access: one lookup, no exception path.
+    backing = disk.backing
+    info = getattr(disk, "deviceInfo", None)
+    cap = getattr(disk, "capacityInBytes", None)
+    return {
+        "label": info.label if info is not None else "disk",
+        "key": disk.key,
+        "capacity_gb": cap / (1024**3) if cap is not None else disk.capacityInKB / 1024 / 1024,
+        "backing_file": getattr(backing, "fileName", None),
+        "mode": getattr(backing, "mode", None),
+        "thinProvisioned": getattr(backing, "thinProvisioned", None),
+        "diskType": type(backing).__name__,
+        "controllerKey": disk.controllerKey,
+        "unitNumber": disk.unitNumber,
+    }
+def _retrieve_all(pc: Any, filter_spec: Any, page_size: int = _PC_PAGE_SIZE) -> List[Any]:
+    """
+    RetrievePropertiesEx + ContinueRetrievePropertiesEx token loop: every ObjectContent, one
+    round trip per page. Objects deleted mid-enumeration (ManagedObjectNotFound) are dropped.
+    """
+    PC = vmodl.query.PropertyCollector
+    out: List[Any] = []
+    res = pc.RetrievePropertiesEx([filter_spec], PC.RetrieveOptions(maxObjects=page_size))
+    while res is not None:
+        for oc in res.objects or []:
+            if any(isinstance(getattr(m, "fault", None), vmodl.fault.ManagedObjectNotFound) for m in getattr(oc, "missingSet", None) or []):
+                continue
+            out.append(oc)
+        if not res.token:
+            break
+        res = pc.ContinueRetrievePropertiesEx(token=res.token)
+    return out
+def _is_incomplete_body(e: BaseException) -> bool:
+    # Connection dropped mid-body: urllib3 ProtocolError (IncompleteRead) or our short-count check
+    # (raised with msg= so the text survives; VMwareError's first positional field is `code`).
+    if urllib3 is not None and isinstance(e, urllib3.exceptions.ProtocolError): # type: ignore[attr-defined]
+        return True
+    if isinstance(e, (http.client.IncompleteRead, ConnectionResetError)): # _copy_body() readinto path
+        return True
+    if isinstance(e, requests.exceptions.ChunkedEncodingError):
+        return True
+    return isinstance(e, VMwareError) and str(e).startswith("incomplete download")
+def _safe_unlink(p: Any) -> None:
+    # One unlink() syscall; a missing file (or any other failure) is not an error here.
+    try:
+        os.unlink(p)
+    except OSError:
+        pass
+def _replace_or_copy(src: Path, dst: Path) -> None:
+    """
+    os.replace(src, dst); if they live on different filesystems (EXDEV) copy with
+    os.sendfile (in-kernel, no userspace buffers) and drop src. shutil.move elsewhere.
+    """
+    try:
+        os.replace(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    if not hasattr(os, "sendfile"): # pragma: no cover - non-Linux
+        shutil.move(str(src), str(dst))
+        return
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        size = os.fstat(fin.fileno()).st_size
+        off = 0
+        while off < size:
+            n = os.sendfile(fout.fileno(), fin.fileno(), off, min(size - off, 1 << 30))
+            if n <= 0:
+                raise OSError(errno.EIO, f"sendfile stalled at {off}/{size}: {src} -> {dst}")
+            off += n
+    os.unlink(src)
+def _fadvise_sequential(fd: int) -> None:
+    # Best-effort kernel hint for large streamed files (missing on some platforms).
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError: # pragma: no cover
+            pass
+def _fadvise_random(fd: int) -> None:
+    # Scattered in-place writes (CBT extents): no readahead around partially written pages.
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+        except OSError: # pragma: no cover
+            pass
+def _preallocate(fd: int, offset: int, length: int) -> None:
+    # Reserve [offset, offset+length) in one go (fewer extent allocations / journal commits than
+    # growing the file chunk by chunk). Extends st_size, so writers must not use O_APPEND.
+    # Best-effort: platforms/filesystems without posix_fallocate just skip it.
+    fallocate = getattr(os, "posix_fallocate", None)
+    if fallocate is None or length <= 0: # pragma: no cover - macOS/Windows
+        return
+    try:
+        fallocate(fd, offset, length)
+    except OSError: # pragma: no cover - e.g. EOPNOTSUPP on some network filesystems
+        pass
+def _copy_body(r: Any, dst: Any, chunk_size: int, *, reuse: bool, alloc: Any = bytearray) -> None:
+    """
+    Copy a streamed requests response body into dst.write().
+    Identity-encoded bodies are read with the underlying http.client readinto(), bypassing
+    urllib3's read() and its intermediate bytes objects:
+      - reuse=True (dst writes or copies synchronously): one reusable buffer for the whole body;
+      - reuse=False (dst keeps the chunk, e.g. the write-behind queue): alloc(chunk_size) per
+        chunk (a fresh or recycled bytearray) whose ownership passes to dst, filled in place.
+    When urllib3 has to decode the body, shutil.copyfileobj over r.raw.
+    """
+    raw = r.raw
+    fp = getattr(raw, "_fp", None)
+    enc = str(r.headers.get("content-encoding", "") or "").strip().lower()
+    if enc not in ("", "identity") or not callable(getattr(fp, "readinto", None)):
+        raw.decode_content = True
+        shutil.copyfileobj(raw, dst, length=chunk_size)
+        return
+    if reuse:
+        mv = memoryview(bytearray(chunk_size))
+        while True:
+            n = fp.readinto(mv)
+            if not n:
+                break
+            dst.write(mv[:n])
+    else:
+        while True:
+            buf = alloc(chunk_size)
+            n = fp.readinto(buf)
+            if not n:
+                break
+            dst.write(buf if n == chunk_size else memoryview(buf)[:n])
+    # urllib3 returns the connection to the pool when it sees the body end; do the same here
+    # so closing the response keeps the keep-alive connection.
+    if fp.isclosed():
+        raw.release_conn()
+def _write_all(fd: int, buf: Any) -> None:
+    # os.write() may return short counts on large buffers; loop until drained.
+    mv = memoryview(buf)
+    while mv:
+        n = os.write(fd, mv)
+        mv = mv[n:]
+def _writev_all(fd: int, bufs: List[Any]) -> None:
+    # One writev() for a batch of queued chunks; finish any short write chunk by chunk.
+    if len(bufs) == 1 or not hasattr(os, "writev"):
+        for b in bufs:
+            _write_all(fd, b)
+        return
+    n = os.writev(fd, bufs)
+    for b in bufs:
+        if n >= len(b):
+            n -= len(b)
+            continue
+        _write_all(fd, memoryview(b)[n:])
+        n = 0
+def _pwritev_all(fd: int, bufs: List[Any], off: int) -> None:
+    # One pwritev() for a run of contiguous chunks starting at off; finish any short write with pwrite().
+    n = os.pwritev(fd, bufs, off) if len(bufs) > 1 and hasattr(os, "pwritev") else 0
+    w = _PositionalWriter(fd)
+    for b in bufs:
+        if n >= len(b):
+            n -= len(b)
+        else:
+            w.seek(off + n)
+            w.write(memoryview(b)[n:])
+            n = 0
+        off += len(b)
+def _copy_exact(src: Any, dst: Any, length: int, chunk_size: int) -> int:
+    # Stream at most `length` bytes from src into dst; returns the count (short only on EOF).
+    got = 0
+    while got < length:
+        buf = src.read(min(chunk_size, length - got))
+        if not buf:
+            break
+        dst.write(buf)
+        got += len(buf)
+    return got
+def _discard(src: Any, n: int, chunk_size: int) -> int:
+    # Read and drop n bytes (the unchanged gap inside a coalesced CBT request).
+    return _copy_exact(src, _NullSink, n, chunk_size)
+class _NullSink:
+    @staticmethod
+    def write(buf: bytes) -> int:
+        return len(buf)
+_extent_pair = attrgetter("start", "length") # DiskChangeExtent -> (start, length)
+def _coalesce_extents(
+    areas: Any, *, gap: int = _CBT_MERGE_GAP, max_len: int = _CBT_MERGE_MAX
+) -> List[Tuple[int, int, List[Tuple[int, int]]]]:
+    """
+    Merge CBT extents separated by <= gap bytes into (start, length, [(start, length), ...]) groups.
+    One HTTP Range covers each group; only the original sub-extents are written locally.
+    Empty extents (length <= 0, reported by some transports) are dropped: "bytes=s-(s-1)" is not a Range.
+    """
+    groups: List[Tuple[int, int, List[Tuple[int, int]]]] = []
+    add = groups.append
+    cur_start = cur_end = -1
+    parts: List[Tuple[int, int]] = []
+    # C-level attribute extraction + tuple sort (pyvmomi longs are already ints); this runs over
+    # tens of thousands of extents, so the loop below avoids per-extent max()/int() calls.
+    for ext in sorted(map(_extent_pair, areas)):
+        start, length = ext
+        if length <= 0:
+            continue
+        end = start + length
+        hi = end if end > cur_end else cur_end
+        if parts and start - cur_end <= gap and hi - cur_start <= max_len:
+            parts.append(ext)
+            cur_end = hi
+            continue
+        if parts:
+            add((cur_start, cur_end - cur_start, parts))
+        cur_start, cur_end, parts = start, end, [ext]
+    if parts:
+        add((cur_start, cur_end - cur_start, parts))
+    return groups
+def _batch_groups(
+    groups: List[Tuple[int, int, List[Tuple[int, int]]]], *, per: int, max_bytes: int = _CBT_MERGE_MAX
+) -> List[List[Tuple[int, int, List[Tuple[int, int]]]]]:
+    """
+    Split coalesced groups into multi-range GET batches of at most `per` ranges and (unless a
+    single group is already larger) at most `max_bytes` requested bytes, keeping offset order.
+    """
+    batches: List[List[Tuple[int, int, List[Tuple[int, int]]]]] = []
+    cur: List[Tuple[int, int, List[Tuple[int, int]]]] = []
+    size = 0
+    for g in groups:
+        if cur and (len(cur) >= per or size + g[1] > max_bytes):
+            batches.append(cur)
+            cur, size = [], 0
+        cur.append(g)
+        size += g[1]
+    if cur:
+        batches.append(cur)
+    return batches
+def _parse_content_range(v: Optional[str]) -> Tuple[int, int]:
+    # "bytes 100-199/1000" -> (100, 199)
+    m = re.match(r"\s*bytes\s+(\d+)-(\d+)/(?:\d+|\*)\s*$", v or "")
+    if not m:
+        raise VMwareError(msg=f"bad Content-Range: {v!r}")
+    return int(m.group(1)), int(m.group(2))
+def _multipart_boundary(content_type: str) -> bytes:
+    m = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not m:
+        raise VMwareError(msg=f"multipart/byteranges without boundary: {content_type!r}")
+    return m.group(1).strip().encode("latin-1")
+def _iter_byteranges(rd: Any, boundary: bytes) -> Any:
+    """
+    Walk a multipart/byteranges body: yields (start, end) per part, leaving `rd` positioned
+    at the part body. The caller must consume exactly end-start+1 bytes before resuming.
+    """
+    delim = b"--" + boundary
+    while True:
+        line = rd.readline(65536)
+        if not line:
+            raise VMwareError(msg="multipart/byteranges: unexpected end of body")
+        line = line.strip()
+        if not line:
+            continue
+        if line == delim + b"--":
+            return
+        if line != delim:
+            raise VMwareError(msg=f"multipart/byteranges: unexpected line {line[:80]!r}")
+        cr = None
+        while True:
+            hl = rd.readline(65536)
+            if not hl:
+                raise VMwareError(msg="multipart/byteranges: unexpected end of part headers")
+            hl = hl.strip()
+            if not hl:
+                break
+            k, _, v = hl.partition(b":")
+            if k.strip().lower() == b"content-range":
+                cr = v.strip().decode("latin-1")
+        yield _parse_content_range(cr)
+def _write_span(src: Any, f: Any, span_start: int, span_len: int, extents: List[Tuple[int, int]], chunk_size: int) -> int:
+    """
+    Consume span_len bytes of src (disk bytes starting at span_start) and write only the parts
+    that fall inside `extents` (sorted (start, length)); the rest is read and dropped.
+    Returns the number of extent bytes written; raises VMwareError on a short body.
+    """
+    pos = span_start
+    stop = span_start + span_len
+    written = 0
+    for es, el in extents:
+        lo, hi = max(es, pos), min(es + el, stop)
+        if hi <= lo:
+            continue
+        if lo > pos and _discard(src, lo - pos, chunk_size) != lo - pos:
+            raise VMwareError(msg=f"short read for range {span_start}-{stop - 1}: body ended before {lo}")
+        f.seek(lo)
+        n = _copy_exact(src, f, hi - lo, chunk_size)
+        written += n
+        if n != hi - lo:
+            raise VMwareError(msg=f"short read for range {span_start}-{stop - 1}: got={lo + n - span_start} expected={span_len}")
+        pos = hi
+    if stop > pos and _discard(src, stop - pos, chunk_size) != stop - pos:
+        raise VMwareError(msg=f"short read for range {span_start}-{stop - 1}: body ended before {stop}")
+    return written
+class _PositionalWriter:
+    """
+    seek()/write() facade over os.pwrite() on a shared fd. Each instance keeps its own offset,
+    so concurrent workers can write into one open file without locks or seek/write races.
+    """
+    def __init__(self, fd: int):
+        self._fd = fd
+        self._off = 0
+    def seek(self, off: int) -> None:
+        self._off = off
+    def write(self, buf: Any) -> int:
+        mv = memoryview(buf)
+        n0 = len(mv)
+        while mv:
+            n = os.pwrite(self._fd, mv, self._off)
+            self._off += n
+            mv = mv[n:]
+        return n0
+class _MmapWriter(_PositionalWriter):
+    """
+    _PositionalWriter over a shared mmap of the target: writes become a memcpy into the page cache.
+    Anything reaching past the mapped size (file grew / extent beyond EOF) goes through pwrite().
+    """
+    def __init__(self, mm: Any, fd: int):
+        super().__init__(fd)
+        self._mm = mm
+    def write(self, buf: Any) -> int:
+        n = len(buf)
+        end = self._off + n
+        if end > len(self._mm):
+            return super().write(buf)
+        self._mm[self._off:end] = buf
+        self._off = end
+        return n
+class _PwriteQueue:
+    """
+    Shared submission queue for positional writes: fetch workers enqueue (offset, bytes) and go
+    straight back to the socket while one helper thread issues the pwrite()s in arrival order.
+    Whatever is queued when the writer wakes is flushed together: runs of contiguous chunks
+    (one extent read chunk by chunk) become a single pwritev() instead of one pwrite() each.
+    At most `max_bytes` are queued (a single larger buffer is still accepted when nothing is
+    pending); submit() blocks until the writer catches up. The first error is re-raised on
+    submit()/close(). Buffers must be immutable (bytes), as urllib3 reads return.
+    """
+    def __init__(self, fd: int, *, max_bytes: int):
+        self.fd = fd
+        # Bounded by bytes below, not by item count: chunk_size is user-tunable
+        self._q: "queue.Queue[Optional[Tuple[int, bytes]]]" = queue.Queue()
+        self._max = max(1, int(max_bytes))
+        self._pending = 0
+        self._cv = threading.Condition()
+        self._err: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="vsphere-cbt-writer", daemon=True)
+        self._thread.start()
+    def _drain(self) -> None:
+        q = self._q
+        while True:
+            batch = [q.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch and self._err is None: # else keep draining so producers never block on a dead writer
+                try:
+                    self._flush(batch)
+                except BaseException as e: # pragma: no cover - disk full / EIO
+                    self._err = e
+            if batch:
+                done = sum(len(b) for _, b in batch)
+                with self._cv:
+                    self._pending -= done
+                    self._cv.notify_all()
+            if stop:
+                return
+    def _flush(self, batch: List[Tuple[int, bytes]]) -> None:
+        run_off, buf = batch[0]
+        run = [buf]
+        end = run_off + len(buf)
+        for off, buf in batch[1:]:
+            if off == end and len(run) < _IOV_MAX:
+                run.append(buf)
+                end += len(buf)
+                continue
+            _pwritev_all(self.fd, run, run_off)
+            run_off, run, end = off, [buf], off + len(buf)
+        _pwritev_all(self.fd, run, run_off)
+    def submit(self, off: int, buf: bytes) -> None:
+        n = len(buf)
+        with self._cv:
+            while self._pending and self._pending + n > self._max and self._err is None:
+                self._cv.wait()
+            if self._err is not None:
+                raise self._err
+            self._pending += n
+        self._q.put((off, buf))
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(None)
+        self._thread.join()
+        if self._err is not None:
+            raise self._err
+class _QueuedWriter(_PositionalWriter):
+    """_PositionalWriter that hands its writes to a shared _PwriteQueue instead of blocking on pwrite()."""
+    def __init__(self, wq: _PwriteQueue):
+        super().__init__(wq.fd)
+        self._wq = wq
+    def write(self, buf: Any) -> int:
+        n = len(buf)
+        self._wq.submit(self._off, buf)
+        self._off += n
+        return n
+class _CountingSink:
+    """
+    File-like shim for shutil.copyfileobj(): forwards writes to `f`, counts bytes,
+    and reports progress via on_bytes(n, total). Progress must never break downloads.
+    """
+    def __init__(self, f: Any, on_bytes: Optional[Any], total: int):
+        self._f = f
+        self._on_bytes = on_bytes
+        self._total = total
+        self.got = 0
+    def write(self, buf: bytes) -> int:
+        n = len(buf)
+        self._f.write(buf)
+        self.got += n
+        if self._on_bytes is not None:
+            try:
+                self._on_bytes(n, self._total)
+            except Exception:
+                pass
+        return n
+class _CoalescingWriter:
+    """
+    Gathers small writes into one preallocated buffer and hands them to `f` in `size`-byte writes.
+    libcurl's write callback delivers whatever a single recv() produced (often a few KiB), so
+    without this the disk sees hundreds of small writes per MiB. flush() writes the tail.
+    """
+    def __init__(self, f: Any, size: int):
+        self._f = f
+        self._mv = memoryview(bytearray(max(1, size)))
+        self._n = 0
+    def write(self, buf: Any) -> int:
+        n = len(buf)
+        pos = self._n
+        if pos + n > len(self._mv):
+            self.flush()
+            pos = 0
+            if n >= len(self._mv):
+                self._f.write(buf)
+                return n
+        self._mv[pos:pos + n] = buf
+        self._n = pos + n
+        return n
+    def flush(self) -> None:
+        if self._n:
+            self._f.write(self._mv[:self._n])
+            self._n = 0
+class _WriteBehindFile:
+    """
+    Write-only file sink that hands chunks to a helper thread.
+    The HTTPS reader keeps pulling from the socket while the previous chunk is
+    still being written out (os.write releases the GIL), so network receive and
+    storage writeback overlap instead of alternating. At most `depth` chunks are
+    in flight; whatever has queued up by the time the writer gets to it goes out with
+    one writev(). The first write error is re-raised on the caller's next write()/close().
+    Callers hand over ownership of each buffer: it must not be modified after write().
+    buffer(size) hands out chunk buffers that the writer thread recycles once written, so a long
+    transfer cycles through a few fixed allocations instead of a new one per chunk.
+    append=True continues at the current end of file; prealloc reserves that many bytes past it.
+    """
+    def __init__(self, path: Path, *, depth: int = _WRITE_BEHIND_DEPTH, append: bool = False, prealloc: int = 0):
+        # No O_APPEND: a preallocated file is already longer than what has been written.
+        flags = os.O_WRONLY | os.O_CREAT | (0 if append else os.O_TRUNC)
+        self._fd = os.open(str(path), flags, 0o644)
+        start = os.lseek(self._fd, 0, os.SEEK_END) if append else 0
+        _fadvise_sequential(self._fd)
+        if prealloc:
+            _preallocate(self._fd, start, prealloc)
+        self._q: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max(1, int(depth)))
+        self._free: List[bytearray] = [] # written buffers ready for reuse (list ops are atomic)
+        self._buf_size = 0
+        self._err: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="vsphere-write-behind", daemon=True)
+        self._thread.start()
+    def _drain(self) -> None:
+        done = False
+        while not done:
+            batch = [self._q.get()]
+            while batch[-1] is not None: # at most depth chunks are queued
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            if self._err is not None or not batch:
+                continue # keep draining so the producer never blocks on a dead writer
+            try:
+                _writev_all(self._fd, batch)
+            except BaseException as e: # pragma: no cover - disk full / EIO
+                self._err = e
+                continue
+            size = self._buf_size
+            self._free.extend(b for b in batch if type(b) is bytearray and len(b) == size)
+    def buffer(self, size: int) -> bytearray:
+        if size != self._buf_size:
+            self._buf_size = size
+            self._free = []
+        try:
+            return self._free.pop()
+        except IndexError:
+            return bytearray(size)
+    def write(self, buf: bytes) -> int:
+        if self._err is not None:
+            raise self._err
+        self._q.put(buf)
+        return len(buf)
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._q.put(None)
+            self._thread.join()
+        finally:
+            os.close(self._fd)
+        if self._err is not None:
+            raise self._err
+    def __enter__(self) -> "_WriteBehindFile":
+        return self
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 # Govmomi wrapper
 class GovmomiCLI(GovcRunner):
     """
@@ -102,7 +803,7 @@ class GovmomiCLI(GovcRunner):
         Returns list of VM dicts.
         Uses:
           - govc find -type m -json .
-          - govc vm.info -json per vm (bounded by govc_max_detail)
+          - govc vm.info -json per vm (bounded by govc_max_detail; govc_parallel at a time, default 8)
         If inventory is too large, returns only names + inventory paths.
         """
         t0 = time.monotonic()
@@ -116,50 +817,59 @@ class GovmomiCLI(GovcRunner):
                 self.logger.info(
                     f"govc: inventory has {len(vms)} VMs; returning names only (govc_max_detail={max_detail})"
                 )
-                self.logger.debug(f"govc: list_vm_names took {_fmt_duration(time.monotonic() - t0)}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"govc: list_vm_names took {_fmt_duration(time.monotonic() - t0)}")
             except Exception:
                 pass
-            out = [{"name": str(p).split("/")[-1], "path": p} for p in vms]
-            return sorted(out, key=lambda x: x.get("name", ""))
-        detailed: List[Dict[str, Any]] = []
-        for pth in vms:
+            # every entry carries "name", so sort with a C-level key
+            return sorted(({"name": str(p).rpartition("/")[2], "path": p} for p in vms), key=itemgetter("name"))
+        def _detail(pth: Any) -> Optional[Dict[str, Any]]:
             try:
                 info = self.run_json(["vm.info", "-json", str(pth)]) or {}
                 arr = info.get("VirtualMachines") or []
                 if not arr:
-                    continue
+                    return None
                 vm = arr[0]
                 cfg = (vm.get("Config") or {})
                 runtime = (vm.get("Runtime") or {})
                 guest = (vm.get("Guest") or {})
                 summary = (vm.get("Summary") or {})
-                detailed.append(
-                    {
-                        "name": cfg.get("Name") or str(pth).split("/")[-1],
-                        "runtime.powerState": runtime.get("PowerState"),
-                        "summary.overallStatus": (summary.get("OverallStatus") or ""),
-                        "summary.guest.guestFullName": (cfg.get("GuestFullName") or ""),
-                        "summary.config.memorySizeMB": cfg.get("MemoryMB"),
-                        "summary.config.numCpu": cfg.get("NumCPU"),
-                        "summary.config.vmPathName": (cfg.get("VmPathName") or ""),
-                        "summary.config.instanceUuid": cfg.get("InstanceUuid"),
-                        "summary.config.uuid": cfg.get("Uuid"),
-                        "guest.guestState": guest.get("GuestState"),
-                        "path": pth,
-                    }
-                )
+                return {
+                    "name": cfg.get("Name") or str(pth).rpartition("/")[2],
+                    "runtime.powerState": runtime.get("PowerState"),
+                    "summary.overallStatus": (summary.get("OverallStatus") or ""),
+                    "summary.guest.guestFullName": (cfg.get("GuestFullName") or ""),
+                    "summary.config.memorySizeMB": cfg.get("MemoryMB"),
+                    "summary.config.numCpu": cfg.get("NumCPU"),
+                    "summary.config.vmPathName": (cfg.get("VmPathName") or ""),
+                    "summary.config.instanceUuid": cfg.get("InstanceUuid"),
+                    "summary.config.uuid": cfg.get("Uuid"),
+                    "guest.guestState": guest.get("GuestState"),
+                    "path": pth,
+                }
             except Exception as e:
                 try:
                     self.logger.debug(f"govc: vm.info failed for {pth}: {e}")
                 except Exception:
                     pass
-                detailed.append({"name": str(pth).split("/")[-1], "path": pth, "error": str(e)})
+                return {"name": str(pth).rpartition("/")[2], "path": pth, "error": str(e)}
+        # Each vm.info is its own govc process + vCenter round trip: run several at once.
+        workers = getattr(self.args, "govc_parallel", None) or os.environ.get("VMDK2KVM_GOVC_PARALLEL") or 8
         try:
-            self.logger.debug(f"govc: list_vm_names took {_fmt_duration(time.monotonic() - t0)}")
+            workers = max(1, int(workers))
         except Exception:
-            pass
-        return sorted(detailed, key=lambda x: x.get("name", ""))
-    def datastore_ls(self, datastore: str, folder: str) -> List[str]:
+            workers = 8
+        workers = min(workers, max(1, len(vms)))
+        if workers == 1:
+            results = [_detail(p) for p in vms]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="govc-vm-info") as ex:
+                results = list(ex.map(_detail, vms))
+        detailed: List[Dict[str, Any]] = [d for d in results if d is not None]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"govc: list_vm_names took {_fmt_duration(time.monotonic() - t0)}")
+        return sorted(detailed, key=itemgetter("name"))
+    def datastore_ls(self, datastore: str, folder: str, recursive: bool = False) -> List[str]:
         """
         List files under a datastore folder via govc.
         Returns:
@@ -167,6 +877,8 @@ class GovmomiCLI(GovcRunner):
         Notes:
           - We call `govc datastore.ls -json -ds <ds> <folder/>` and then parse defensively.
           - govc output shapes vary by version (some return `file:[{path:...}]`).
+          - recursive=True adds -R: the whole subtree in one govc process / one SearchDatastoreSubFolders;
+            entries come back as "sub/dir/name" (each result's folderPath joined with its files).
         """
         t0 = time.monotonic()
         ds, rel = normalize_ds_path(datastore, folder or "")
@@ -182,22 +894,27 @@ class GovmomiCLI(GovcRunner):
         prefix = base.rstrip("/") + "/" if base else ""
         for cand in candidates:
             try:
-                data = self.run_json(["datastore.ls", "-json", "-ds", ds, cand]) or {}
-                paths = extract_paths_from_datastore_ls_json(data)
+                if recursive:
+                    data = self.run_json(["datastore.ls", "-R", "-json", "-ds", ds, cand]) or []
+                    paths = _ls_results_paths(data)
+                else:
+                    data = self.run_json(["datastore.ls", "-json", "-ds", ds, cand]) or {}
+                    paths = extract_paths_from_datastore_ls_json(data)
+                # paths are already str with leading "/" stripped; bind the loop invariants locally
+                plen = len(prefix)
                 out: List[str] = []
-                for p in paths:
-                    relp = str(p).lstrip("/")
-                    if prefix and relp.startswith(prefix):
-                        relp = relp[len(prefix) :]
+                append = out.append
+                for relp in paths:
+                    if plen and relp.startswith(prefix):
+                        relp = relp[plen:]
                     if relp:
-                        out.append(relp)
-                try:
+                        append(relp)
+                # f-strings are built before logging can drop them: only format when DEBUG is on
+                if self.logger.isEnabledFor(logging.DEBUG):
                     self.logger.debug(
-                        f"govc: datastore_ls ds={ds!r} folder={folder!r} cand={cand!r} -> {len(out)} items "
+                        f"govc: datastore_ls ds={ds!r} folder={folder!r} cand={cand!r} recursive={recursive} -> {len(out)} items "
                         f"({_fmt_duration(time.monotonic() - t0)})"
                     )
-                except Exception:
-                    pass
                 return out
             except Exception as e:
                 try:
@@ -205,12 +922,10 @@ class GovmomiCLI(GovcRunner):
                 except Exception:
                     pass
                 continue
-        try:
+        if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(
                 f"govc: datastore_ls ds={ds!r} folder={folder!r} -> 0 items ({_fmt_duration(time.monotonic() - t0)})"
             )
-        except Exception:
-            pass
         return []
 # vSphere CLI mode
 class VsphereMode:
@@ -219,13 +934,84 @@ class VsphereMode:
         self.logger = logger
         self.args = args
         self.govc = GovmomiCLI(logger, args)
+        # Additive: enable extra logs via env/flag without changing behavior. Resolved once:
+        # hot loops test this attribute instead of re-reading env vars and logger levels.
+        self._debug = (
+            _boolish(os.environ.get("VMDK2KVM_DEBUG") or os.environ.get("VMDK2KVM_VSPHERE_DEBUG"))
+            or bool(getattr(args, "debug", False))
+            or logger.isEnabledFor(logging.DEBUG)
+        )
+        # HTTP knobs are fixed for the lifetime of the args: parse them once, not per downloaded file.
+        self._timeout_tuple = self._parse_http_timeout()
+        self._retries_i = self._parse_http_retries()
+        # /folder download knobs (all default on except segments; opt out via args/env):
+        # overlap socket reads with disk writes, resume .part files / skip complete ones,
+        # reserve the body with fallocate, split large files into N parallel Range GETs.
+        self._write_behind = _boolish(self._knob("vs_write_behind", "VMDK2KVM_VSPHERE_WRITE_BEHIND", "1"))
+        self._resume_ok = _boolish(self._knob("vs_resume", "VMDK2KVM_VSPHERE_RESUME", "1"))
+        self._prealloc_ok = _boolish(self._knob("vs_prealloc", "VMDK2KVM_VSPHERE_PREALLOC", "1"))
+        self._http_segments = self._parse_http_segments()
+        # _http_backend() answer, resolved on first use (it may warn about a missing pycurl)
+        self._backend_once: Optional[str] = None
+        # Datastore name -> vim.Datastore, filled by one inventory pass; reset per connection.
+        self._ds_cache: Dict[str, Any] = {}
+        # _prefer_govmomi() result for the current run(); govc.available() forks `govc version`.
+        self._prefer_once: Optional[bool] = None
+        # _transport_preference() / _client_has_vddk() answers for the current run(); the VDDK probe
+        # is reflection plus client capability calls, keyed by id(client).
+        self._transport_once: Optional[str] = None
+        self._vddk_cache: Dict[int, bool] = {}
+        # (VM moId, snapshot name) -> SnapshotTree or None; reset per run (snapshots change between runs)
+        self._snap_cache: Dict[Tuple[Any, str], Any] = {}
+        # Keep-alive /folder session shared by every HTTPS download; closed at the end of run()
+        self._http: Optional[Any] = None
+        self._http_cookie: Optional[str] = None
+        self._http_verify = True
+        # pycurl backend: one easy handle per worker thread (handles keep their own connection cache)
+        self._curl_local = threading.local()
+        self._curl_handles: List[Any] = []
+        # download_only_vm fills the session/backend/VDDK memos from worker threads: one builder at a time
+        self._lazy_lock = threading.RLock()
+    def _knob(self, attr: str, env: str, default: Optional[str] = None) -> Any:
+        # args.<attr> when set, else the environment variable, else default
+        v = getattr(self.args, attr, None)
+        if v is None:
+            v = os.environ.get(env, default)
+        return v
+    def _parse_http_segments(self) -> int:
+        # args.vs_http_segments / VMDK2KVM_VSPHERE_HTTP_SEGMENTS (opt-in; 1 = single stream)
+        sg = self._knob("vs_http_segments", "VMDK2KVM_VSPHERE_HTTP_SEGMENTS")
+        try:
+            return max(1, int(sg)) if sg is not None else 1
+        except Exception:
+            return 1
+    def _parse_http_timeout(self) -> Tuple[int, int]:
+        # args.vs_http_timeout / VMDK2KVM_VSPHERE_HTTP_TIMEOUT: "10,300" (connect,read) or "300" (read)
+        timeout = getattr(self.args, "vs_http_timeout", None)
+        if timeout is None:
+            timeout = os.environ.get("VMDK2KVM_VSPHERE_HTTP_TIMEOUT")
+        if not timeout:
+            return _DEFAULT_HTTP_TIMEOUT
+        try:
+            if isinstance(timeout, str) and "," in timeout:
+                a, b = timeout.split(",", 1)
+                return (int(a.strip()), int(b.strip()))
+            return (10, int(str(timeout).strip()))
+        except Exception:
+            return _DEFAULT_HTTP_TIMEOUT
+    def _parse_http_retries(self) -> int:
+        # args.vs_http_retries / VMDK2KVM_VSPHERE_HTTP_RETRIES (default 3, never negative)
+        retries = getattr(self.args, "vs_http_retries", None)
+        if retries is None:
+            retries = os.environ.get("VMDK2KVM_VSPHERE_HTTP_RETRIES")
+        try:
+            retries_i = int(retries) if retries is not None else 3
+        except Exception:
+            retries_i = 3
+        return max(0, retries_i)
     def _debug_enabled(self) -> bool:
-        # Additive: enable extra logs via env/flag without changing behavior
-        if _boolish(os.environ.get("VMDK2KVM_DEBUG") or os.environ.get("VMDK2KVM_VSPHERE_DEBUG")):
-            return True
-        if bool(getattr(self.args, "debug", False)):
-            return True
-        return self.logger.isEnabledFor(logging.DEBUG)
+        # Kept for callers; the answer is resolved once in __init__ (see self._debug).
+        return self._debug
     def _dc_name(self) -> str:
         """
         Resolve datacenter name safely.
@@ -235,16 +1021,27 @@ class VsphereMode:
         """
         v = getattr(self.args, "dc_name", None)
         return v if v else "ha-datacenter"
+    def _chunk_size(self, default: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Streaming chunk size: --chunk_size, then args.vs_chunk_size / VMDK2KVM_VSPHERE_CHUNK_SIZE,
+        then the caller's default (see resolve_chunk_size).
+        """
+        return resolve_chunk_size(self.args, default)
     def _prefer_govmomi(self) -> bool:
         """
         If govc/govmomi is available and user didn't disable it, prefer it for:
           - list_vm_names (inventory traversal is often better)
           - datastore listing (for download-only flows)
+        Probed once per run(); later calls reuse the answer.
         """
+        if self._prefer_once is not None:
+            return self._prefer_once
         if bool(getattr(self.args, "no_govmomi", False)):
+            self._prefer_once = False
             return False
         ok = self.govc.available()
-        if self._debug_enabled():
+        self._prefer_once = ok
+        if self._debug:
             try:
                 self.logger.debug(f"vsphere: govc available={ok} govc_bin={getattr(self.govc, 'govc_bin', None)!r}")
             except Exception:
@@ -260,7 +1057,12 @@ class VsphereMode:
           - args.vs_transport (or args.vs_download_transport)
           - env VMDK2KVM_VSPHERE_TRANSPORT (or VSPHERE_TRANSPORT)
           - default: "vddk"
+        Resolved once per run().
         """
+        if self._transport_once is None:
+            self._transport_once = self._resolve_transport()
+        return self._transport_once
+    def _resolve_transport(self) -> str:
         v = getattr(self.args, "vs_transport", None) or getattr(self.args, "vs_download_transport", None)
         if not v:
             v = os.environ.get("VMDK2KVM_VSPHERE_TRANSPORT") or os.environ.get("VSPHERE_TRANSPORT")
@@ -270,6 +1072,16 @@ class VsphereMode:
         # tolerate junk, don't crash CLI
         return "vddk"
     def _client_has_vddk(self, client: VMwareClient) -> bool:
+        # Probed once per client per run(); per-file callers get a dict lookup.
+        key = id(client)
+        ok = self._vddk_cache.get(key)
+        if ok is None:
+            with self._lazy_lock:
+                ok = self._vddk_cache.get(key)
+                if ok is None:
+                    ok = self._vddk_cache[key] = self._probe_vddk(client)
+        return ok
+    def _probe_vddk(self, client: VMwareClient) -> bool:
         """
         Feature-detect VDDK support on the client.
         Fix: make detection *accurate*, not just "attribute exists".
@@ -286,7 +1098,7 @@ class VsphereMode:
                 if callable(fn):
                     return bool(fn())
             except Exception as e:
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(f"vsphere: VDDK probe {name}() raised: {_short_exc(e)}")
             return None
         # 1) Explicit capability methods on VMwareClient
@@ -296,11 +1108,11 @@ class VsphereMode:
                     fn = getattr(client, meth)
                     if callable(fn):
                         ok = bool(fn())
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(f"vsphere: VDDK probe client.{meth}() -> {ok}")
                         return ok
                 except Exception as e:
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: VDDK probe client.{meth}() error: {_short_exc(e)}")
         # 2) Known VDDK download callables on VMwareClient
         for name in (
@@ -313,11 +1125,11 @@ class VsphereMode:
             try:
                 fn = getattr(client, name, None)
                 if callable(fn):
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: VDDK probe found callable: client.{name}")
                     return True
             except Exception as e:
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(f"vsphere: VDDK probe error for client.{name}: {_short_exc(e)}")
         # 3) VDDK helper objects hanging off the client (common patterns)
         for attr in (
@@ -333,36 +1145,36 @@ class VsphereMode:
             try:
                 obj = getattr(client, attr)
                 if obj is None:
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: VDDK probe client.{attr} is None")
                     continue
                 # If it's a boolean-ish flag, respect it.
                 if isinstance(obj, bool):
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: VDDK probe client.{attr} (bool) -> {obj}")
                     return bool(obj)
                 # If helper object reports availability via common names.
                 for meth in ("available", "is_available", "enabled", "is_enabled", "ready", "is_ready"):
                     ok = _call_bool(obj, meth)
                     if ok is not None:
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(f"vsphere: VDDK probe client.{attr}.{meth}() -> {ok}")
                         return ok
                 # Some implementations expose a path/home string; treat as "present" only if non-empty.
                 if isinstance(obj, (str, Path)):
                     s = str(obj).strip()
                     if s:
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(f"vsphere: VDDK probe client.{attr} path-like -> {s!r}")
                         return True
                 # As a last resort: non-None object strongly implies VDDK wiring exists.
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(f"vsphere: VDDK probe client.{attr} present (type={type(obj).__name__})")
                 return True
             except Exception as e:
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(f"vsphere: VDDK probe error for client.{attr}: {_short_exc(e)}")
-        if self._debug_enabled():
+        if self._debug:
             self.logger.debug("vsphere: VDDK not detected on VMwareClient")
         return False
     def _download_one_file_prefer_vddk(
@@ -376,7 +1188,7 @@ class VsphereMode:
         local_path: Path,
         verify_tls: bool,
         on_bytes: Optional[Any] = None,
-        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> None:
         """
         Prefer VDDK when available, otherwise fall back to HTTPS /folder download.
@@ -390,7 +1202,7 @@ class VsphereMode:
             pref = "https"
         if pref == "auto":
             pref = "vddk"
-        if self._debug_enabled():
+        if self._debug:
             self.logger.debug(
                 f"vsphere: download transport pref={pref!r} vddk_detected={self._client_has_vddk(client)} "
                 f"ds=[{ds_name}] path={ds_path!r} -> {str(local_path)!r}"
@@ -410,14 +1222,14 @@ class VsphereMode:
                             chunk_size=chunk_size,
                             on_bytes=on_bytes,
                         )
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(
                                 f"vsphere: VDDK download_datastore_file_vddk ok in {_fmt_duration(time.monotonic()-t0)}"
                             )
                         return
                     except TypeError:
                         fn(ds_name, ds_path, local_path)
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(
                                 f"vsphere: VDDK download_datastore_file_vddk(positional) ok in {_fmt_duration(time.monotonic()-t0)}"
                             )
@@ -428,7 +1240,7 @@ class VsphereMode:
                         fn2(datastore=ds_name, ds_path=ds_path, local_path=local_path, dc_name=dc_name)
                     except TypeError:
                         fn2(ds_name, ds_path, local_path)
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(
                             f"vsphere: VDDK download_disk_vddk ok in {_fmt_duration(time.monotonic()-t0)}"
                         )
@@ -452,23 +1264,25 @@ class VsphereMode:
             chunk_size=chunk_size,
         )
     # Download-only VM folder helpers
-    def _parse_vm_datastore_dir(self, vmx_path: str) -> Tuple[str, str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_vm_datastore_dir(vmx_path: str) -> Tuple[str, str]:
         """
         vm.summary.config.vmPathName looks like:
           "[datastore1] folder/vm.vmx"
         Return: (datastore_name, folder_path)
+        Pure function of its input, so results are memoized (errors are not cached).
         """
         s = (vmx_path or "").strip()
         if not s.startswith("[") or "]" not in s:
             raise VMwareError(f"Unexpected vmPathName format: {vmx_path}")
         ds = s[1 : s.index("]")]
         rest = s[s.index("]") + 1 :].strip() # "folder/vm.vmx"
-        if "/" not in rest:
-            folder = ""
-        else:
-            folder = rest.rsplit("/", 1)[0].lstrip("/")
+        folder = rest.rpartition("/")[0].lstrip("/")
         return ds, folder
-    def _parse_datastore_dir_override(self, s: str, *, default_ds: Optional[str] = None) -> Tuple[str, str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_datastore_dir_override(s: str, *, default_ds: Optional[str] = None) -> Tuple[str, str]:
         """
         Override parser for download_only_vm folder listing.
         Accepts:
@@ -484,53 +1298,93 @@ class VsphereMode:
             ds = t[1 : t.index("]")]
             rest = t[t.index("]") + 1 :].strip()
             rest = rest.lstrip("/")
-            if "/" in rest:
-                folder = rest.rsplit("/", 1)[0]
-            else:
-                folder = ""
+            folder = rest.rpartition("/")[0]
             return ds, folder.strip("/")
         if not default_ds:
             raise VMwareError("vs_datastore_dir provided without datastore and default datastore is unknown")
         folder = t.strip().lstrip("/").rstrip("/")
         # If user passed a file-like tail, take dirname
-        if "/" in folder and "." in folder.split("/")[-1]:
-            folder = folder.rsplit("/", 1)[0]
+        head, sep, tail = folder.rpartition("/")
+        if sep and "." in tail:
+            folder = head
         return str(default_ds), folder.strip("/")
     def _find_datastore_obj(self, client: VMwareClient, datastore_name: str) -> vim.Datastore:
         """
         Find a vim.Datastore object by name using inventory.
         Best-effort across folders/datacenters.
+        The first lookup fetches every datastore name in one PropertyCollector call and caches them,
+        so later lookups (same or other names) are dict hits. The childEntity walk remains as a fallback.
         """
+        ds = self._ds_cache.get(datastore_name)
+        if ds is not None:
+            return ds
         t0 = time.monotonic()
         content = client._content()
+        try:
+            self._collect_datastores(content)
+        except Exception as e:
+            if self._debug:
+                self.logger.debug(f"vsphere: datastore PropertyCollector query failed; walking inventory: {e}")
+        ds = self._ds_cache.get(datastore_name)
+        if ds is not None:
+            if self._debug:
+                self.logger.debug(
+                    f"vsphere: found datastore {datastore_name!r} in {_fmt_duration(time.monotonic()-t0)} "
+                    f"(cached {len(self._ds_cache)} datastores)"
+                )
+            return ds
         def iter_children(obj):
             try:
                 return list(getattr(obj, "childEntity", []) or [])
             except Exception:
                 return []
+        def remember(dc) -> None:
+            for d in (dc.datastore or []):
+                try:
+                    self._ds_cache.setdefault(d.name, d)
+                except Exception:
+                    continue
         for top in iter_children(content.rootFolder):
             try:
                 if isinstance(top, vim.Datacenter):
-                    for ds in (top.datastore or []):
-                        if ds.name == datastore_name:
-                            if self._debug_enabled():
-                                self.logger.debug(
-                                    f"vsphere: found datastore {datastore_name!r} in {_fmt_duration(time.monotonic()-t0)}"
-                                )
-                            return ds
+                    remember(top)
                 elif isinstance(top, vim.Folder):
                     for child in iter_children(top):
                         if isinstance(child, vim.Datacenter):
-                            for ds in (child.datastore or []):
-                                if ds.name == datastore_name:
-                                    if self._debug_enabled():
-                                        self.logger.debug(
-                                            f"vsphere: found datastore {datastore_name!r} in {_fmt_duration(time.monotonic()-t0)}"
-                                        )
-                                    return ds
+                            remember(child)
             except Exception:
                 continue
-        raise VMwareError(f"Datastore not found in inventory: {datastore_name}")
+        ds = self._ds_cache.get(datastore_name)
+        if ds is None:
+            raise VMwareError(f"Datastore not found in inventory: {datastore_name}")
+        if self._debug:
+            self.logger.debug(
+                f"vsphere: found datastore {datastore_name!r} in {_fmt_duration(time.monotonic()-t0)} "
+                f"(cached {len(self._ds_cache)} datastores)"
+            )
+        return ds
+    def _collect_datastores(self, content: Any) -> None:
+        """
+        One PropertyCollector round trip: rootFolder -> (folders) -> Datacenter.datastore -> Datastore.name.
+        Fills self._ds_cache without per-object SOAP GETs on childEntity/datastore/name.
+        """
+        PC = vmodl.query.PropertyCollector
+        folder_ts = PC.TraversalSpec(
+            name="folderTraversal",
+            type=vim.Folder,
+            path="childEntity",
+            skip=False,
+            selectSet=[PC.SelectionSpec(name="folderTraversal"), PC.SelectionSpec(name="dcToDs")],
+        )
+        dc_ts = PC.TraversalSpec(name="dcToDs", type=vim.Datacenter, path="datastore", skip=False)
+        filter_spec = PC.FilterSpec(
+            objectSet=[PC.ObjectSpec(obj=content.rootFolder, skip=True, selectSet=[folder_ts, dc_ts])],
+            propSet=[PC.PropertySpec(type=vim.Datastore, all=False, pathSet=["name"])],
+        )
+        for oc in _retrieve_all(content.propertyCollector, filter_spec):
+            for prop in getattr(oc, "propSet", None) or []:
+                if prop.name == "name" and prop.val:
+                    self._ds_cache.setdefault(str(prop.val), oc.obj)
     def _list_vm_folder_files_pyvmomi(
         self,
         client: VMwareClient,
@@ -540,45 +1394,72 @@ class VsphereMode:
         include_glob: List[str],
         exclude_glob: List[str],
         max_files: int,
+        recursive: bool = False,
+        include_re: Optional["re.Pattern[str]"] = None,
+        exclude_re: Optional["re.Pattern[str]"] = None,
     ) -> List[str]:
         """
         Use HostDatastoreBrowser to list files in the VM folder.
         Returns list of datastore-relative paths like: "folder/file.vmdk"
+        With recursive=True a single SearchDatastoreSubFolders_Task covers the whole subtree.
         """
         t0 = time.monotonic()
         browser = datastore_obj.browser # vim.HostDatastoreBrowser
         ds_folder_path = f"[{ds_name}] {folder}" if folder else f"[{ds_name}]"
         spec = vim.HostDatastoreBrowserSearchSpec()
-        spec.details = vim.FileQueryFlags(fileOwner=True, fileSize=True, fileType=True, modification=True)
+        # Additive: owner/mtime are never used downstream; only ask vCenter for what we consume.
+        spec.details = vim.FileQueryFlags(fileOwner=False, fileSize=True, fileType=True, modification=False)
         spec.sortFoldersFirst = True
-        if self._debug_enabled():
+        op = "SearchDatastoreSubFolders_Task" if recursive else "SearchDatastore_Task"
+        if self._debug:
             self.logger.debug(
-                f"vsphere: pyvmomi SearchDatastore_Task path={ds_folder_path!r} include={include_glob} exclude={exclude_glob}"
+                f"vsphere: pyvmomi {op} path={ds_folder_path!r} include={include_glob} exclude={exclude_glob}"
             )
-        task = browser.SearchDatastore_Task(datastorePath=ds_folder_path, searchSpec=spec)
+        task = getattr(browser, op)(datastorePath=ds_folder_path, searchSpec=spec)
         client.wait_for_task(task)
         result = getattr(task.info, "result", None)
         if not result:
-            if self._debug_enabled():
+            if self._debug:
                 self.logger.debug(
-                    f"vsphere: pyvmomi SearchDatastore_Task returned no result ({_fmt_duration(time.monotonic()-t0)})"
+                    f"vsphere: pyvmomi {op} returned no result ({_fmt_duration(time.monotonic()-t0)})"
                 )
             return []
+        # SearchDatastoreSubFolders_Task returns one result per folder; flatten folderPath + file.path.
+        # Subfolders show up twice: as a FolderFileInfo entry of their parent and as a result of
+        # their own. Only files are kept (a "/folder/<dir>" GET is not a file download).
+        results = list(result) if recursive else [result]
+        entries: List[Tuple[str, str]] = []
+        dirs = set()
+        for res in results:
+            fp = str(getattr(res, "folderPath", "") or "")
+            # "[ds] folder/sub" -> "folder/sub"
+            dir_rel = fp.split("]", 1)[1].strip().strip("/") if "]" in fp else fp.strip("/")
+            dirs.add(dir_rel)
+            for f in getattr(res, "file", []) or []:
+                if isinstance(f, vim.FolderFileInfo):
+                    continue
+                name = getattr(f, "path", None)
+                if name:
+                    entries.append((dir_rel, name))
+        if recursive:
+            entries = [(d, n) for d, n in entries if (f"{d}/{n}" if d else n) not in dirs]
         files: List[str] = []
         base = folder.rstrip("/")
-        for f in getattr(result, "file", []) or []:
-            name = getattr(f, "path", None)
-            if not name:
-                continue
-            rel = f"{base}/{name}" if base else name
-            if include_glob and not any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(name, pat) for pat in include_glob):
+        inc = include_re if include_re is not None else compile_globs(include_glob)
+        exc = exclude_re if exclude_re is not None else compile_globs(exclude_glob)
+        for dir_rel, name in entries:
+            if recursive:
+                rel = f"{dir_rel}/{name}" if dir_rel else name
+            else:
+                rel = f"{base}/{name}" if base else name
+            if inc and not (inc.match(rel) or inc.match(name)):
                 continue
-            if exclude_glob and any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(name, pat) for pat in exclude_glob):
+            if exc and (exc.match(rel) or exc.match(name)):
                 continue
+            if max_files and len(files) >= max_files:
+                raise VMwareError(f"Refusing to download > max_files={max_files} (found so far: {len(files) + 1})")
             files.append(rel)
-            if max_files and len(files) > max_files:
-                raise VMwareError(f"Refusing to download > max_files={max_files} (found so far: {len(files)})")
-        if self._debug_enabled():
+        if self._debug:
             self.logger.debug(
                 f"vsphere: pyvmomi listed {len(files)} files in {_fmt_duration(time.monotonic()-t0)}"
             )
@@ -592,29 +1473,43 @@ class VsphereMode:
         include_glob: List[str],
         exclude_glob: List[str],
         max_files: int,
+        include_re: Optional["re.Pattern[str]"] = None,
+        exclude_re: Optional["re.Pattern[str]"] = None,
     ) -> List[str]:
         """
         Prefer govmomi/govc for datastore listing when available, else fall back to pyvmomi.
+        include_re/exclude_re: globs precompiled by the caller (compile_globs); built here if omitted.
+        Recursive listing (vs_recursive) is one `govc datastore.ls -R` (or one pyvmomi
+        SearchDatastoreSubFolders_Task when govc is not used).
         """
+        recursive = bool(getattr(self.args, "vs_recursive", False))
+        if include_re is None:
+            include_re = compile_globs(include_glob)
+        if exclude_re is None:
+            exclude_re = compile_globs(exclude_glob)
         if self._prefer_govmomi():
             try:
                 t0 = time.monotonic()
-                rels = self.govc.datastore_ls(ds_name, folder)
+                rels = self.govc.datastore_ls(ds_name, folder, recursive=recursive)
                 files: List[str] = []
                 base = folder.rstrip("/")
+                inc = include_re
+                exc = exclude_re
                 for name in rels:
                     rel = f"{base}/{name}" if base and name else (base or name)
                     if not rel:
                         continue
-                    bn = rel.split("/")[-1]
-                    if include_glob and not any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(bn, pat) for pat in include_glob):
+                    # basename comes from the (short) entry name, not the full rel path
+                    src = name or rel
+                    bn = src.rpartition("/")[2]
+                    if inc and not (inc.match(rel) or inc.match(bn)):
                         continue
-                    if exclude_glob and any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(bn, pat) for pat in exclude_glob):
+                    if exc and (exc.match(rel) or exc.match(bn)):
                         continue
+                    if max_files and len(files) >= max_files:
+                        raise VMwareError(f"Refusing to download > max_files={max_files} (found so far: {len(files) + 1})")
                     files.append(rel)
-                    if max_files and len(files) > max_files:
-                        raise VMwareError(f"Refusing to download > max_files={max_files} (found so far: {len(files)})")
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(
                         f"vsphere: govc listing produced {len(files)} files in {_fmt_duration(time.monotonic()-t0)}"
                     )
@@ -629,7 +1524,257 @@ class VsphereMode:
             include_glob=include_glob,
             exclude_glob=exclude_glob,
             max_files=max_files,
+            recursive=recursive,
+            include_re=include_re,
+            exclude_re=exclude_re,
         )
+    def _http_session(self, cookie: str, retries: int, verify_tls: bool = True) -> Any:
+        """
+        Lazily created requests.Session for /folder downloads, reused for the rest of run().
+        The vCenter session cookie is kept in the session headers and swapped if it rotates.
+        All pooled connections share one SSLContext (see _SharedSSLAdapter).
+        Called from download workers: creation and the cookie swap happen under _lazy_lock.
+        """
+        with self._lazy_lock:
+            http = self._http
+            if http is not None and self._http_verify != verify_tls:
+                self._close_http()
+                http = None
+            if http is None:
+                http = requests.Session()
+                adapter = _SharedSSLAdapter(
+                    ssl_context=_shared_ssl_context(verify_tls),
+                    pool_connections=4,
+                    pool_maxsize=_HTTP_POOL_MAXSIZE,
+                    max_retries=_retry_policy(retries),
+                )
+                http.mount("https://", adapter)
+                http.mount("http://", adapter)
+                self._http = http
+                self._http_cookie = None
+                self._http_verify = verify_tls
+            if cookie != self._http_cookie:
+                http.headers["Cookie"] = cookie
+                self._http_cookie = cookie
+            return http
+    def _close_http(self) -> None:
+        with self._lazy_lock:
+            http, self._http, self._http_cookie = self._http, None, None
+            handles, self._curl_handles, self._curl_local = self._curl_handles, [], threading.local()
+        if http is not None:
+            try:
+                http.close()
+            except Exception:
+                pass
+        for c in handles:
+            try:
+                c.close()
+            except Exception:
+                pass
+    def _http_backend(self) -> str:
+        # Resolved once: per-file calls must not re-read args/env (or repeat the warning below).
+        if self._backend_once is not None:
+            return self._backend_once
+        with self._lazy_lock:
+            if self._backend_once is None:
+                v = getattr(self.args, "vs_http_backend", None) or os.environ.get("VMDK2KVM_VSPHERE_HTTP_BACKEND")
+                v = str(v).strip().lower() if v else "requests"
+                if v == "pycurl" and pycurl is None:
+                    self.logger.warning("vsphere: vs_http_backend=pycurl but pycurl is not installed; using requests")
+                    v = "requests"
+                self._backend_once = v if v in ("requests", "pycurl") else "requests"
+            return self._backend_once
+    def _download_via_pycurl(
+        self,
+        url: str,
+        tmp: Path,
+        *,
+        cookie: str,
+        verify_tls: bool,
+        timeout: Tuple[int, int],
+        retries: int,
+        resume_ok: bool,
+        on_bytes: Optional[Any] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        libcurl transfer of one /folder file into tmp: TLS, HTTP and the receive loop run in C and
+        the write callback only hands libcurl's buffer to the file. Each worker thread reuses its
+        own easy handle, so keep-alive connections carry over between files. An existing .part is
+        continued with CURLOPT_RESUME_FROM_LARGE; connection-level failures resume from what was
+        written, up to `retries` times. Returns the final size of tmp.
+        """
+        c = getattr(self._curl_local, "curl", None)
+        if c is None:
+            c = pycurl.Curl()
+            self._curl_local.curl = c
+            self._curl_handles.append(c)
+        c.reset()
+        c.setopt(pycurl.URL, url)
+        c.setopt(pycurl.COOKIE, cookie)
+        c.setopt(pycurl.FOLLOWLOCATION, 1)
+        c.setopt(pycurl.FAILONERROR, 1)
+        c.setopt(pycurl.NOSIGNAL, 1)
+        c.setopt(pycurl.SSL_VERIFYPEER, 1 if verify_tls else 0)
+        c.setopt(pycurl.SSL_VERIFYHOST, 2 if verify_tls else 0)
+        c.setopt(pycurl.CONNECTTIMEOUT, int(timeout[0]))
+        # requests' read timeout ~ "no bytes for N seconds"
+        c.setopt(pycurl.LOW_SPEED_LIMIT, 1)
+        c.setopt(pycurl.LOW_SPEED_TIME, int(timeout[1]))
+        c.setopt(pycurl.BUFFERSIZE, max(16 * 1024, min(chunk_size, _CURL_MAX_BUFFER)))
+        retry_after: List[Optional[float]] = [None]
+        def _header(line: bytes) -> None:
+            if line[:12].lower() == b"retry-after:":
+                retry_after[0] = _parse_retry_after(line[12:])
+        c.setopt(pycurl.HEADERFUNCTION, _header)
+        backoff = _Backoff()
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after[0] = None
+            wait: Optional[float] = None
+            resume = 0
+            if resume_ok:
+                try:
+                    resume = tmp.stat().st_size
+                except OSError:
+                    resume = 0
+            c.setopt(pycurl.RESUME_FROM_LARGE, resume)
+            with open(tmp, "ab" if resume else "wb") as f:
+                _fadvise_sequential(f.fileno())
+                out = _CoalescingWriter(f, chunk_size)
+                counter = _CountingSink(out, on_bytes, 0)
+                if on_bytes is not None and resume and attempt == 1:
+                    try:
+                        on_bytes(resume, 0)
+                    except Exception:
+                        pass
+                c.setopt(pycurl.WRITEFUNCTION, counter.write)
+                restart = False
+                try:
+                    c.perform()
+                    out.flush()
+                    # libcurl reports a 416 on resume as success with an empty body
+                    restart = int(c.getinfo(pycurl.RESPONSE_CODE) or 0) == 416
+                    if not restart:
+                        return resume + counter.got
+                except pycurl.error as e:
+                    out.flush() # keep what arrived: the retry resumes right after it
+                    code = e.args[0] if e.args else 0
+                    status = 0
+                    try:
+                        status = int(c.getinfo(pycurl.RESPONSE_CODE) or 0)
+                    except Exception:
+                        pass
+                    if self._debug:
+                        self.logger.debug(
+                            f"vsphere: curl attempt {attempt}/{retries+1} failed code={code} status={status} err={_short_exc(e)}"
+                        )
+                    # 416 / range error: .part is not a prefix of the remote file (or ranges unsupported)
+                    restart = status == 416 or code == pycurl.E_RANGE_ERROR
+                    if status in (429, 503):
+                        wait = retry_after[0]
+                    if attempt > retries or not (restart or code in _CURL_RESUMABLE or _is_transient_http(status)):
+                        raise VMwareError(msg=f"curl /folder download failed after {attempt} attempt(s): {_short_exc(e)}")
+            if restart or not resume_ok:
+                _safe_unlink(tmp)
+            if not restart:
+                backoff.sleep(wait)
+    def _resume_enabled(self) -> bool:
+        # Resume a leftover .part via Range and skip files already complete (resolved in __init__)
+        return self._resume_ok
+    def _already_downloaded(
+        self, client: VMwareClient, *, vc_host: str, dc_name: str, ds_name: str, ds_path: str, local_path: Path, verify_tls: bool,
+    ) -> bool:
+        """
+        True when local_path already holds the whole remote file (same size per a /folder HEAD),
+        so a re-run of download_only_vm does not fetch it again. Any doubt means "download".
+        """
+        try:
+            size = local_path.stat().st_size
+        except OSError:
+            return False
+        if not REQUESTS_AVAILABLE:
+            return False
+        http = self._http_session(client._session_cookie(), self._retries_i, verify_tls)
+        url = _folder_url(vc_host, dc_name, ds_name, ds_path)
+        try:
+            r = http.head(url, verify=verify_tls, timeout=self._timeout_tuple, allow_redirects=True)
+            r.close()
+            remote = int(r.headers.get("content-length", "-1") or "-1") if r.status_code == 200 else -1
+        except Exception as e:
+            if self._debug:
+                self.logger.debug(f"vsphere: HEAD {url!r} failed: {_short_exc(e)}")
+            return False
+        return remote == size
+    def _ranged_size(self, http: Any, url: str, verify_tls: bool, timeout: Any) -> int:
+        # HEAD: Content-Length if the server advertises "Accept-Ranges: bytes", else 0 (no splitting).
+        try:
+            r = http.head(url, verify=verify_tls, timeout=timeout, allow_redirects=True)
+            r.close()
+            if r.status_code != 200 or "bytes" not in str(r.headers.get("accept-ranges", "")).lower():
+                return 0
+            return int(r.headers.get("content-length", "0") or "0")
+        except Exception as e:
+            if self._debug:
+                self.logger.debug(f"vsphere: HEAD {url!r} failed: {_short_exc(e)}")
+            return 0
+    def _download_segmented(
+        self,
+        http: Any,
+        url: str,
+        tmp: Path,
+        total: int,
+        segments: int,
+        *,
+        verify_tls: bool,
+        timeout: Any,
+        on_bytes: Optional[Any] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Fetch `total` bytes of url into tmp as `segments` parallel "Range: bytes=a-b" GETs.
+        tmp is sized (and posix_fallocate()d when supported) up front; each worker pwrite()s its
+        slice at its own offset. Raises on any non-206 / mismatched Content-Range / short slice.
+        """
+        step = -(-total // segments)
+        spans = [(a, min(step, total - a)) for a in range(0, total, step)]
+        report = None
+        if on_bytes is not None:
+            lock = threading.Lock()
+            def report(n: int, _total: int) -> None:
+                with lock:
+                    on_bytes(n, total)
+        fd = os.open(str(tmp), os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, total)
+            _preallocate(fd, 0, total)
+            def _fetch(start: int, length: int) -> None:
+                end = start + length - 1
+                with http.get(
+                    url, headers={"Range": f"bytes={start}-{end}"}, verify=verify_tls, stream=True, timeout=timeout
+                ) as r:
+                    r.raise_for_status()
+                    cr = str(r.headers.get("content-range", ""))
+                    if r.status_code != 206 or not cr.startswith(f"bytes {start}-{end}/"):
+                        raise VMwareError(msg=f"range {start}-{end} not honoured: status={r.status_code} content-range={cr!r}")
+                    w = _PositionalWriter(fd)
+                    w.seek(start)
+                    sink = _CountingSink(w, report, total)
+                    _copy_body(r, sink, chunk_size, reuse=True)
+                    if sink.got != length:
+                        raise VMwareError(msg=f"short read for range {start}-{end}: got={sink.got} expected={length}")
+            with ThreadPoolExecutor(max_workers=len(spans), thread_name_prefix="vsphere-seg") as ex:
+                futs = [ex.submit(_fetch, a, n) for a, n in spans]
+                try:
+                    for fut in as_completed(futs):
+                        fut.result()
+                except BaseException:
+                    for f in futs:
+                        f.cancel()
+                    raise
+        finally:
+            os.close(fd)
     def _download_one_folder_file(
         self,
         client: VMwareClient,
@@ -641,80 +1786,121 @@ class VsphereMode:
         verify_tls: bool,
         *,
         on_bytes: Optional[Any] = None,
-        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> None:
         """
         Download a single datastore file via /folder endpoint using the session cookie from VMwareClient.
+        Requests go through the shared keep-alive session (see _http_session), so TLS handshakes
+        happen per pooled connection rather than per file.
         Enhancements (additive):
           - request timeouts (connect/read)
-          - small retry loop for transient HTTP errors
+          - transient HTTP errors / connect failures retried by urllib3 Retry (jittered backoff,
+            Retry-After honoured); dropped bodies resume after a decorrelated-jitter delay
           - debug logs: url (no cookie), sizes, duration
           - safer temp file handling + cleanup on failure
+          - write-behind sink: disk writes run on a helper thread, overlapping network reads
+            (bodies no larger than one chunk are written inline, without thread or fallocate)
+          - Range resume: an existing .part is continued with "Range: bytes=N-" (206 appends,
+            200 starts over); dropped connections keep the .part so the retry only fetches the tail
+          - optional segmented GET (vs_http_segments / VMDK2KVM_VSPHERE_HTTP_SEGMENTS): large files
+            whose HEAD advertises byte ranges are split into parallel Range requests
+          - posix_fallocate() of the announced Content-Length (vs_prealloc / VMDK2KVM_VSPHERE_PREALLOC);
+            an interrupted body is truncated back to what was written so resume offsets stay exact
+          - optional libcurl transport (vs_http_backend / VMDK2KVM_VSPHERE_HTTP_BACKEND = pycurl)
         """
         if not REQUESTS_AVAILABLE:
             raise VMwareError("requests not installed. Install: pip install requests")
-        quoted_path = quote(ds_path, safe="/")
-        url = f"https://{vc_host}/folder/{quoted_path}?dcPath={quote(dc_name)}&dsName={quote(ds_name)}"
+        url = _folder_url(vc_host, dc_name, ds_name, ds_path)
         cookie = client._session_cookie()
-        headers = {"Cookie": cookie}
         # Silence urllib3 warnings when verify is disabled (common for lab vCenters)
-        if not verify_tls and urllib3 is not None: # pragma: no cover
-            try:
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning) # type: ignore[attr-defined]
-            except Exception:
-                pass
+        if not verify_tls:
+            _silence_insecure_warnings()
         local_path.parent.mkdir(parents=True, exist_ok=True)
         tmp = local_path.with_suffix(local_path.suffix + ".part")
-        timeout = getattr(self.args, "vs_http_timeout", None)
-        if timeout is None:
-            timeout = os.environ.get("VMDK2KVM_VSPHERE_HTTP_TIMEOUT")
-        if timeout:
-            # allow "10,300" or "300"
-            try:
-                if isinstance(timeout, str) and "," in timeout:
-                    a, b = timeout.split(",", 1)
-                    timeout_tuple = (int(a.strip()), int(b.strip()))
-                else:
-                    t = int(str(timeout).strip())
-                    timeout_tuple = (10, t)
-            except Exception:
-                timeout_tuple = _DEFAULT_HTTP_TIMEOUT
-        else:
-            timeout_tuple = _DEFAULT_HTTP_TIMEOUT
-        retries = getattr(self.args, "vs_http_retries", None)
-        if retries is None:
-            retries = os.environ.get("VMDK2KVM_VSPHERE_HTTP_RETRIES")
-        try:
-            retries_i = int(retries) if retries is not None else 3
-        except Exception:
-            retries_i = 3
-        if retries_i < 0:
-            retries_i = 0
-        if self._debug_enabled():
+        timeout_tuple = self._timeout_tuple
+        retries_i = self._retries_i
+        http = self._http_session(cookie, retries_i, verify_tls)
+        # Knobs parsed once in __init__
+        write_behind = self._write_behind
+        resume_ok = self._resume_ok
+        prealloc_ok = self._prealloc_ok
+        segments = self._http_segments
+        if self._debug:
             try:
                 self.logger.debug(
                     "vsphere: HTTPS /folder download: "
                     f"url={url!r} verify_tls={verify_tls} timeout={timeout_tuple} chunk_size={chunk_size} "
+                    f"write_behind={write_behind} resume={resume_ok} segments={segments} "
                     f"cookie={_redact_cookie(cookie)!r}"
                 )
             except Exception:
                 pass
-        # Always start fresh for this file (we don't attempt resume here).
-        try:
-            if tmp.exists():
-                tmp.unlink()
-        except Exception:
-            pass
+        # Without resume, always start fresh for this file.
+        if not resume_ok:
+            _safe_unlink(tmp)
+        if self._http_backend() == "pycurl":
+            t0 = time.monotonic()
+            got = self._download_via_pycurl(
+                url, tmp,
+                cookie=cookie, verify_tls=verify_tls, timeout=timeout_tuple, retries=retries_i,
+                resume_ok=resume_ok, on_bytes=on_bytes, chunk_size=chunk_size,
+            )
+            _replace_or_copy(tmp, local_path)
+            if self._debug:
+                self.logger.debug(
+                    f"vsphere: curl download ok: ds=[{ds_name}] path={ds_path!r} "
+                    f"bytes={_fmt_bytes(got)} dur={_fmt_duration(time.monotonic() - t0)}"
+                )
+            return
+        # A leftover .part is continued by the single-stream path below (Range: bytes=N-).
+        if segments > 1 and not tmp.exists():
+            size = self._ranged_size(http, url, verify_tls, timeout_tuple)
+            n = min(segments, size // _SEGMENT_MIN_SIZE)
+            if n > 1:
+                t0 = time.monotonic()
+                try:
+                    self._download_segmented(
+                        http, url, tmp, size, n,
+                        verify_tls=verify_tls, timeout=timeout_tuple, on_bytes=on_bytes, chunk_size=chunk_size,
+                    )
+                    _replace_or_copy(tmp, local_path)
+                    if self._debug:
+                        self.logger.debug(
+                            f"vsphere: HTTPS segmented download ok: ds=[{ds_name}] path={ds_path!r} "
+                            f"bytes={_fmt_bytes(size)} segments={n} dur={_fmt_duration(time.monotonic() - t0)}"
+                        )
+                    return
+                except Exception as e:
+                    # A half-filled segmented .part is not a prefix of the file: never resume it.
+                    self.logger.warning(f"vsphere: segmented download of {ds_path!r} failed; retrying as one stream: {_short_exc(e)}")
+                    _safe_unlink(tmp)
         attempt = 0
         last_err: Optional[BaseException] = None
+        backoff = _Backoff()
         t0 = time.monotonic()
         while True:
             attempt += 1
             try:
                 got = 0
                 total = 0
-                with requests.get(url, headers=headers, verify=verify_tls, stream=True, timeout=timeout_tuple) as r:
-                    status = int(getattr(r, "status_code", 0) or 0)
+                resume = 0
+                if resume_ok:
+                    try:
+                        resume = tmp.stat().st_size
+                    except OSError:
+                        resume = 0
+                # Cookie lives on the session; only the resume Range is per request
+                req_headers = {"Range": f"bytes={resume}-"} if resume else None
+                with http.get(
+                    url, headers=req_headers, verify=verify_tls, stream=True, timeout=timeout_tuple
+                ) as r:
+                    status = r.status_code
+                    if status == 416 and resume:
+                        # .part is not a prefix of the remote file (or already past its end): start over.
+                        if self._debug:
+                            self.logger.debug(f"vsphere: HTTPS resume at {resume} rejected (416); restarting {ds_path!r}")
+                        tmp.unlink(missing_ok=True) # must not fail silently: the retry would resume at the same offset
+                        continue
                     if status >= 400:
                         # consume body for better server-side logging sometimes (but keep small)
                         try:
@@ -722,25 +1908,57 @@ class VsphereMode:
                         except Exception:
                             pass
                         r.raise_for_status()
-                    total = int(r.headers.get("content-length", "0") or "0")
-                    with open(tmp, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=chunk_size):
-                            if not chunk:
-                                continue
-                            f.write(chunk)
-                            got += len(chunk)
-                            if on_bytes is not None:
+                    # 206 -> server honoured the Range, append; 200 -> full body, truncate.
+                    append = bool(resume) and status == 206
+                    if append and not str(r.headers.get("content-range", "")).startswith(f"bytes {resume}-"):
+                        raise VMwareError(msg=f"unexpected Content-Range for resume at {resume}: {r.headers.get('content-range')!r}")
+                    if not append:
+                        resume = 0
+                    clen = int(r.headers.get("content-length", "0") or "0")
+                    total = resume + clen if clen else 0
+                    if append and attempt == 1 and on_bytes is not None:
+                        # bytes left over from an earlier run count toward this file's progress
+                        try:
+                            on_bytes(resume, total)
+                        except Exception:
+                            pass
+                    if self._debug and append:
+                        self.logger.debug(f"vsphere: HTTPS resuming {ds_path!r} at {_fmt_bytes(resume)}")
+                    # Small files (.vmx, .nvram, logs, descriptors): a body that fits in one chunk
+                    # gains nothing from a writer thread or fallocate(), so skip both.
+                    small = 0 < clen <= chunk_size
+                    prealloc = clen if prealloc_ok and not small else 0
+                    behind = write_behind and not small
+                    if behind:
+                        sink = _WriteBehindFile(tmp, append=append, prealloc=prealloc)
+                    else:
+                        sink = open(tmp, "r+b" if append else "wb")
+                        if append:
+                            sink.seek(0, os.SEEK_END)
+                        _fadvise_sequential(sink.fileno())
+                        if prealloc:
+                            _preallocate(sink.fileno(), resume, prealloc)
+                    with sink as f:
+                        # Copy straight from the response stream, never via iter_content. The
+                        # write-behind queue keeps references to chunks, so only a synchronous
+                        # sink may use the reusable readinto() buffer.
+                        counter = _CountingSink(f, on_bytes, total)
+                        try:
+                            _copy_body(r, counter, chunk_size, reuse=not behind, alloc=f.buffer if behind else bytearray)
+                        finally:
+                            got = resume + counter.got
+                            if prealloc and got < total:
+                                # Drop the reserved-but-unwritten tail: the .part size is the resume offset.
                                 try:
-                                    on_bytes(len(chunk), total)
-                                except Exception:
-                                    # progress must never break downloads
+                                    os.truncate(tmp, got)
+                                except OSError:
                                     pass
                 # Basic sanity: if server provided content-length, ensure we got it
                 if total and got != total:
-                    raise VMwareError(f"incomplete download: got={got} expected={total}")
-                # Atomic replace
-                os.replace(tmp, local_path)
-                if self._debug_enabled():
+                    raise VMwareError(msg=f"incomplete download: got={got} expected={total}")
+                # Atomic replace (sendfile copy if the .part ended up on another filesystem)
+                _replace_or_copy(tmp, local_path)
+                if self._debug:
                     self.logger.debug(
                         f"vsphere: HTTPS download ok: ds=[{ds_name}] path={ds_path!r} "
                         f"bytes={_fmt_bytes(got)} total={_fmt_bytes(total)} "
@@ -748,45 +1966,280 @@ class VsphereMode:
                     )
                 return
             except requests.RequestException as e:
+                # Connect failures and transient statuses were already retried (with backoff)
+                # by the session's urllib3 Retry; whatever surfaces here is final, except a body
+                # dropped mid-stream (ChunkedEncodingError is a RequestException): keep the .part.
                 last_err = e
-                # Determine transientness
-                status = None
-                try:
-                    resp = getattr(e, "response", None)
-                    if resp is not None:
-                        status = int(getattr(resp, "status_code", 0) or 0)
-                except Exception:
-                    status = None
-                transient = bool(status and _is_transient_http(status))
-                if self._debug_enabled():
+                resumable = resume_ok and _is_incomplete_body(e)
+                if self._debug:
+                    status = getattr(getattr(e, "response", None), "status_code", None)
                     self.logger.debug(
-                        f"vsphere: HTTPS attempt {attempt}/{retries_i+1} failed "
-                        f"status={status} transient={transient} err={_short_exc(e)}"
+                        f"vsphere: HTTPS attempt {attempt}/{retries_i+1} failed status={status} "
+                        f"resumable={resumable} err={_short_exc(e)}"
                     )
-                # cleanup tmp between attempts
-                try:
-                    if tmp.exists():
-                        tmp.unlink()
-                except Exception:
-                    pass
-                if attempt > retries_i or not transient:
-                    break
-                # tiny backoff
-                time.sleep(min(2.0 * attempt, 8.0))
-                continue
+                if resumable and attempt <= retries_i:
+                    backoff.sleep()
+                    continue
+                if not resumable:
+                    _safe_unlink(tmp)
+                break
             except Exception as e:
                 last_err = e
-                if self._debug_enabled():
+                # A dropped body is resumable: keep the .part and retry from where it stopped.
+                resumable = resume_ok and _is_incomplete_body(e)
+                if self._debug:
                     self.logger.debug(
-                        f"vsphere: HTTPS attempt {attempt}/{retries_i+1} failed err={_short_exc(e)}"
+                        f"vsphere: HTTPS attempt {attempt}/{retries_i+1} failed resumable={resumable} err={_short_exc(e)}"
                     )
+                if resumable and attempt <= retries_i:
+                    backoff.sleep()
+                    continue
+                if not resumable:
+                    _safe_unlink(tmp)
+                break
+        raise VMwareError(f"HTTPS /folder download failed after {attempt} attempt(s): {_short_exc(last_err or Exception('unknown'))}")
+    def _snapshot_by_name(self, vm: Any, name: str) -> Any:
+        """
+        Snapshot tree node (vim.vm.SnapshotTree) by name, or None.
+        Iterative pre-order walk that stops at the first match (on duplicate names the first
+        node in tree order wins, as before); answers are memoized per VM and name for the run.
+        """
+        key = (getattr(vm, "_moId", None) or id(vm), name)
+        if key in self._snap_cache:
+            return self._snap_cache[key]
+        found = None
+        snapshot = getattr(vm, "snapshot", None)
+        stack = list(reversed(getattr(snapshot, "rootSnapshotList", None) or []))
+        while stack:
+            s = stack.pop()
+            if s.name == name:
+                found = s
+                break
+            stack.extend(reversed(s.childSnapshotList or []))
+        self._snap_cache[key] = found
+        return found
+    def _cbt_prealloc(self, fd: int, groups: List[Tuple[int, int, List[Tuple[int, int]]]]) -> None:
+        """
+        Prepare the local disk for concurrent out-of-order extent writes:
+          - ftruncate() up to the last changed byte if the file is shorter (sparse extend, no blocks)
+          - posix_fallocate() each changed extent only, so the gaps stay holes while the writers
+            never race the block allocator for the same extent tree
+        Best-effort: unsupported filesystems/platforms just skip the reservation.
+        """
+        if not groups:
+            return
+        t0 = time.monotonic()
+        end = max(gs + gl for gs, gl, _ in groups)
+        try:
+            if os.fstat(fd).st_size < end:
+                os.ftruncate(fd, end)
+        except OSError as e:
+            if self._debug:
+                self.logger.debug(f"cbt_sync: ftruncate to {end} failed: {_short_exc(e)}")
+        fallocate = getattr(os, "posix_fallocate", None)
+        if fallocate is None: # pragma: no cover - macOS/Windows
+            return
+        n = 0
+        try:
+            for _, _, parts in groups:
+                for ps, pl in parts:
+                    if pl > 0:
+                        fallocate(fd, ps, pl)
+                        n += 1
+        except OSError as e:
+            # EOPNOTSUPP/EINVAL on e.g. some network filesystems: writes will allocate as they go
+            if self._debug:
+                self.logger.debug(f"cbt_sync: posix_fallocate unavailable here: {_short_exc(e)}")
+        if self._debug:
+            self.logger.debug(f"cbt_sync: reserved {n} extents in {_fmt_duration(time.monotonic()-t0)}")
+    def _cbt_sync_ranges(
+        self,
+        *,
+        url: str,
+        headers: Dict[str, str],
+        verify: bool,
+        local_disk: Path,
+        areas: Any,
+        total: int,
+    ) -> int:
+        """
+        Copy CBT changed extents from the snapshot's /folder URL into local_disk (in place).
+        Extents are fetched concurrently (vs_concurrency workers) over one pooled keep-alive Session;
+        extents closer than vs_cbt_merge_gap are coalesced into a single Range, and up to
+        vs_cbt_ranges_per_request ranges share one multipart/byteranges GET (falls back when unsupported).
+        Returns the number of bytes synced; raises Fatal on HTTP errors or short/unranged responses.
+        """
+        # Basic timeouts for CBT range reads
+        timeout_tuple = _DEFAULT_HTTP_TIMEOUT
+        chunk_size = self._chunk_size()
+        workers = max(1, int(getattr(self.args, "vs_concurrency", 4) or 4))
+        gap = self._knob("vs_cbt_merge_gap", "VMDK2KVM_VSPHERE_CBT_MERGE_GAP")
+        try:
+            gap_i = max(0, int(gap)) if gap is not None else _CBT_MERGE_GAP
+        except Exception:
+            gap_i = _CBT_MERGE_GAP
+        # Nearby extents share one Range request; the unchanged bytes between them are read and dropped.
+        groups = _coalesce_extents(areas, gap=gap_i)
+        if self._debug:
+            self.logger.debug(f"cbt_sync: {len(groups)} requests for {len(areas)} extents (merge_gap={gap_i})")
+        per = self._knob("vs_cbt_ranges_per_request", "VMDK2KVM_VSPHERE_CBT_MULTIRANGE")
+        try:
+            per_i = max(1, int(per)) if per is not None else _CBT_RANGES_PER_REQUEST
+        except Exception:
+            per_i = _CBT_RANGES_PER_REQUEST
+        # Several merged ranges per GET (multipart/byteranges), but never fewer batches than workers,
+        # and no more than _CBT_MERGE_MAX bytes per GET (bounded retry cost, workers stay busy).
+        per_i = max(1, min(per_i, -(-len(groups) // workers)))
+        batches = _batch_groups(groups, per=per_i)
+        # Reserve blocks for the changed extents up front (default on); the file stays sparse elsewhere
+        prealloc = _boolish(self._knob("vs_cbt_prealloc", "VMDK2KVM_VSPHERE_CBT_PREALLOC", "1"))
+        # Optional: write through one shared mmap of the local disk instead of pwrite()
+        use_mmap = _boolish(self._knob("vs_cbt_mmap", "VMDK2KVM_VSPHERE_CBT_MMAP", "0"))
+        # Optional: batch disk writes behind one writer thread (async submission, like an io_uring SQ)
+        use_wq = _boolish(self._knob("vs_cbt_write_behind", "VMDK2KVM_VSPHERE_CBT_WRITE_BEHIND", "0"))
+        range_fmt = "{}-{}".format # bound once; called per extent
+        lock = threading.Lock()
+        done = 0
+        multi_ok = True
+        debug = self._debug
+        # Overall progress goes to the debug log in ~1% steps, not once per request
+        log_progress = bool(total) and self.logger.isEnabledFor(logging.DEBUG)
+        log_step = max(1, total // 100) if total else 1
+        next_log = 0
+        def _fetch(session: Any, batch: List[Tuple[int, int, List[Tuple[int, int]]]]) -> None:
+            nonlocal done, multi_ok, next_log
+            if len(batch) > 1 and not multi_ok:
+                for g in batch:
+                    _fetch(session, [g])
+                return
+            extents = [p for _, _, parts in batch for p in parts]
+            want = sum(pl for _, pl in extents)
+            spec = ",".join([range_fmt(gs, gs + gl - 1) for gs, gl, _ in batch])
+            t0 = time.monotonic()
+            written = 0
+            fallback = False
+            # Stream straight into the disk (O(chunk_size) memory, not O(length)).
+            try:
+                # Cookie etc. live on the session; only the Range header is per request
+                with session.get(
+                    url, headers={"Range": "bytes=" + spec}, verify=verify, timeout=timeout_tuple, stream=True
+                ) as r:
+                    r.raise_for_status()
+                    status = r.status_code
+                    clen = int(r.headers.get("content-length", "0") or "0")
+                    ctype = str(r.headers.get("content-type", "") or "")
+                    r.raw.decode_content = True
+                    src: Any = r.raw
+                    if status == 206 and ctype.lower().startswith("multipart/byteranges"):
+                        src = io.BufferedReader(r.raw, buffer_size=min(chunk_size, 1024 * 1024))
+                        spans: Any = ((ps, pe - ps + 1) for ps, pe in _iter_byteranges(src, _multipart_boundary(ctype)))
+                    elif status == 206:
+                        ps, pe = _parse_content_range(r.headers.get("content-range"))
+                        # A single-range reply must be exactly what was asked for; fail before draining the body.
+                        if len(batch) == 1 and (
+                            (ps, pe) != (batch[0][0], batch[0][0] + batch[0][1] - 1) or (clen and clen != pe - ps + 1)
+                        ):
+                            raise Fatal(
+                                2,
+                                f"vsphere cbt_sync: range mismatch for {spec}: "
+                                f"Content-Range={r.headers.get('content-range')!r} Content-Length={clen}",
+                            )
+                        spans = [(ps, pe - ps + 1)]
+                    elif len(batch) == 1 and batch[0][0] == 0 and clen == batch[0][1]:
+                        spans = [(0, clen)]
+                    elif len(batch) > 1:
+                        # No multi-range support (full 200 body): stop reading and go one range per request.
+                        fallback = True
+                        spans = []
+                    else:
+                        # A full-body 200 would land at the wrong offset; refuse before writing.
+                        raise Fatal(2, f"vsphere cbt_sync: server ignored Range {spec} (HTTP {status})")
+                    # positional writes into the shared fd/mapping: no per-request open(), no shared file position
+                    if mm is not None:
+                        f: _PositionalWriter = _MmapWriter(mm, fd)
+                    elif wq is not None:
+                        f = _QueuedWriter(wq)
+                    else:
+                        f = _PositionalWriter(fd)
+                    for ps, pn in spans:
+                        written += _write_span(src, f, ps, pn, extents, chunk_size)
+            except requests.RequestException as e:
+                raise Fatal(2, f"vsphere cbt_sync: HTTP request failed: {e}")
+            if fallback:
+                if multi_ok and debug:
+                    self.logger.debug("cbt_sync: server does not support multi-range; using one range per request")
+                multi_ok = False
+                for g in batch:
+                    _fetch(session, [g])
+                return
+            if written != want:
+                # Range responses can be shorter if server/proxy misbehaves
+                raise Fatal(2, f"vsphere cbt_sync: short read for range {spec}: got={written} expected={want}")
+            with lock:
+                done += want
+                d = done
+                report = log_progress and (d >= next_log or d >= total)
+                if report:
+                    next_log = d + log_step
+            if debug:
+                self.logger.debug(
+                    f"CBT range {spec} ({want} bytes, {len(extents)} extents) ok in {_fmt_duration(time.monotonic()-t0)}"
+                )
+            if report:
+                self.logger.debug(
+                    f"CBT sync: {d/(1024**2):.1f} MiB / {total/(1024**2):.1f} MiB ({(d/total)*100:.1f}%)"
+                )
+        session = requests.Session()
+        session.headers.update(headers)
+        verify = _pin_environment(session, url, verify)
+        # Transient 429/5xx/connect errors are retried per Range (idempotent GETs) instead of failing the sync
+        adapter = _SharedSSLAdapter(
+            pool_connections=workers,
+            pool_maxsize=workers,
+            max_retries=_retry_policy(self._retries_i),
+            ssl_context=_shared_ssl_context(bool(verify)),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        fd = os.open(str(local_disk), os.O_RDWR)
+        _fadvise_random(fd)
+        if prealloc:
+            self._cbt_prealloc(fd, groups)
+        mm = None
+        if use_mmap:
+            try:
+                size = os.fstat(fd).st_size
+                if size:
+                    mm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+            except (OSError, ValueError, OverflowError) as e:
+                if self._debug:
+                    self.logger.debug(f"cbt_sync: mmap of {str(local_disk)!r} failed; using pwrite: {_short_exc(e)}")
+                mm = None
+        wq = _PwriteQueue(fd, max_bytes=_PWRITE_QUEUE_CHUNKS * chunk_size * workers) if (use_wq and mm is None) else None
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vsphere-cbt") as ex:
+                futs = [ex.submit(_fetch, session, b) for b in batches]
+                try:
+                    for fut in as_completed(futs):
+                        fut.result()
+                except BaseException:
+                    # fail fast: drop extents that have not started yet
+                    for fut in futs:
+                        fut.cancel()
+                    raise
+            if wq is not None:
+                wq.close() # all queued writes landed (or raise the first write error)
+        finally:
+            if wq is not None:
                 try:
-                    if tmp.exists():
-                        tmp.unlink()
+                    wq.close()
                 except Exception:
                     pass
-                break
-        raise VMwareError(f"HTTPS /folder download failed after {attempt} attempt(s): {_short_exc(last_err or Exception('unknown'))}")
+            if mm is not None:
+                mm.close()
+            os.close(fd)
+            session.close()
+        return done
     def run(self) -> int:
         vc_host = self.args.vcenter
         vc_user = self.args.vc_user
@@ -799,8 +2252,14 @@ class VsphereMode:
             vc_pass = None
         if not vc_host or not vc_user or not vc_pass:
             raise Fatal(2, "vsphere: --vcenter, --vc-user, and --vc-password (or --vc-password-env) are required")
+        # New connection -> managed object refs from a previous run are stale
+        self._ds_cache = {}
+        self._prefer_once = None
+        self._transport_once = None
+        self._vddk_cache = {}
+        self._snap_cache = {}
         # Additive debug summary (no secrets)
-        if self._debug_enabled():
+        if self._debug:
             try:
                 self.logger.debug(
                     "vsphere: connect params: "
@@ -822,13 +2281,13 @@ class VsphereMode:
         try:
             t0 = time.monotonic()
             client.connect()
-            if self._debug_enabled():
+            if self._debug:
                 self.logger.debug(f"vsphere: connected in {_fmt_duration(time.monotonic()-t0)}")
         except VMwareError as e:
             raise Fatal(2, f"vsphere: Connection failed: {e}")
         try:
             action = self.args.vs_action
-            if self._debug_enabled():
+            if self._debug:
                 self.logger.debug(f"vsphere: action={action!r}")
             # list_vm_names: prefer govmomi/govc when present (more robust inventory)
             if action == "list_vm_names":
@@ -837,10 +2296,9 @@ class VsphereMode:
                         vms = self.govc.list_vm_names()
                         self.logger.info(f"VMs found (govc): {len(vms)}")
                         if self.args.json:
-                            print(json.dumps(vms, indent=2, default=str))
-                        else:
-                            for vm in vms:
-                                print(vm.get("name", "Unnamed VM"))
+                            _write_json(vms)
+                        elif vms:
+                            sys.stdout.write("\n".join(vm.get("name", "Unnamed VM") for vm in vms) + "\n")
                         return 0
                     except Exception as e:
                         self.logger.warning(f"govc list_vm_names failed; falling back to pyvmomi: {e}")
@@ -884,23 +2342,20 @@ class VsphereMode:
                             propSet=[property_spec],
                             objectSet=[obj_spec],
                         )
-                        props = content.propertyCollector.RetrieveContents([filter_spec])
+                        # paged: RetrieveContents stops at vCenter's page limit on big inventories
                         vms = []
-                        for obj in props:
-                            properties = {}
-                            for prop in obj.propSet:
-                                properties[prop.name] = prop.val
-                            properties["moId"] = obj.obj._moId
+                        for obj in _retrieve_all(content.propertyCollector, filter_spec):
+                            properties = {prop.name: prop.val for prop in obj.propSet or []}
+                            properties["moId"] = obj.obj._moId # MoRef field, no round trip
                             vms.append(properties)
                         vms = sorted(vms, key=lambda x: x.get("name", ""))
                         self.logger.info(f"VMs found: {len(vms)}")
-                        if self._debug_enabled():
+                        if self._debug:
                             self.logger.debug(f"vsphere: pyvmomi inventory took {_fmt_duration(time.monotonic()-t0)}")
                         if self.args.json:
-                            print(json.dumps(vms, indent=2, default=str))
-                        else:
-                            for vm in vms:
-                                print(vm.get("name", "Unnamed VM"))
+                            _write_json(vms)
+                        elif vms:
+                            sys.stdout.write("\n".join(vm.get("name", "Unnamed VM") for vm in vms) + "\n")
                     finally:
                         containerView.Destroy()
                 except Exception as e:
@@ -912,27 +2367,55 @@ class VsphereMode:
                 vm = client.get_vm_by_name(self.args.name)
                 if not vm:
                     raise Fatal(2, f"vsphere: VM not found: {self.args.name}")
+                # One PropertyCollector round trip; every vm.<prop> access below would be its own RPC.
+                paths = ["name", "summary", "guest.guestState", "config.version", "config.hardware.device"]
+                try:
+                    props = client.get_vm_properties(vm, paths)
+                except Exception as e:
+                    if self._debug:
+                        self.logger.debug(f"vsphere: get_vm_properties failed; reading attributes: {_short_exc(e)}")
+                    props = {
+                        "name": vm.name,
+                        "summary": vm.summary,
+                        "guest.guestState": vm.guest.guestState,
+                        "config.version": vm.config.version,
+                        "config.hardware.device": vm.config.hardware.device,
+                    }
+                summary = props.get("summary")
+                cfg = summary.config
                 output = {
-                    "name": vm.name,
+                    "name": props.get("name"),
                     "moId": vm._moId,
-                    "powerState": vm.runtime.powerState,
-                    "overallStatus": str(vm.summary.overallStatus),
-                    "guestOS": vm.summary.config.guestFullName,
-                    "memoryMB": vm.summary.config.memorySizeMB,
-                    "numCpu": vm.summary.config.numCpu,
-                    "path": vm.summary.config.vmPathName,
-                    "instance_uuid": vm.summary.config.instanceUuid,
-                    "bios_uuid": vm.summary.config.uuid,
-                    "guestState": vm.guest.guestState,
-                    "summary": str(vm.summary),
-                    "hardwareVersion": vm.config.version,
-                    "numDisks": len(client.vm_disks(vm)),
+                    "powerState": summary.runtime.powerState, # summary.runtime is vm.runtime
+                    "overallStatus": str(summary.overallStatus),
+                    "guestOS": cfg.guestFullName,
+                    "memoryMB": cfg.memorySizeMB,
+                    "numCpu": cfg.numCpu,
+                    "path": cfg.vmPathName,
+                    "instance_uuid": cfg.instanceUuid,
+                    "bios_uuid": cfg.uuid,
+                    "guestState": props.get("guest.guestState"),
+                    # Whitelisted digest: str(summary) walks every nested data object and can be MBs of text.
+                    "summary": {
+                        "overallStatus": str(summary.overallStatus),
+                        "powerState": str(summary.runtime.powerState),
+                        "uptimeSec": getattr(summary.quickStats, "uptimeSeconds", None),
+                        "committedBytes": getattr(summary.storage, "committed", None),
+                    },
+                    "hardwareVersion": props.get("config.version"),
+                    "numDisks": sum(
+                        isinstance(d, vim.vm.device.VirtualDisk) for d in props.get("config.hardware.device") or []
+                    ),
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
-                    print(f"VM: {vm.name}")
-                    print(f"Summary: {vm.summary}")
+                    print(f"VM: {output['name']}")
+                    print(
+                        f"Summary: {output['powerState']}, status={output['overallStatus']}, "
+                        f"{output['numCpu']} vCPU, {output['memoryMB']} MB, {output['numDisks']} disk(s), "
+                        f"{output['hardwareVersion']}, {output['path']}"
+                    )
                 return 0
             if action == "vm_disks":
                 if not self.args.vm_name:
@@ -944,28 +2427,9 @@ class VsphereMode:
                     disks = client.vm_disks(vm)
                 except Exception as e:
                     raise Fatal(2, f"vsphere vm_disks: Failed to retrieve disks: {e}")
-                disk_list = []
-                for idx, disk in enumerate(disks):
-                    backing = disk.backing
-                    disk_info = {
-                        "index": idx,
-                        "label": disk.deviceInfo.label if hasattr(disk, "deviceInfo") else "disk",
-                        "key": disk.key,
-                        "capacity_gb": (
-                            disk.capacityInBytes / (1024**3)
-                            if hasattr(disk, "capacityInBytes")
-                            else disk.capacityInKB / 1024 / 1024
-                        ),
-                        "backing_file": backing.fileName if hasattr(backing, "fileName") else None,
-                        "mode": backing.mode if hasattr(backing, "mode") else None,
-                        "thinProvisioned": backing.thinProvisioned if hasattr(backing, "thinProvisioned") else None,
-                        "diskType": type(backing).__name__,
-                        "controllerKey": disk.controllerKey,
-                        "unitNumber": disk.unitNumber,
-                    }
-                    disk_list.append(disk_info)
+                disk_list = [{"index": idx, **_disk_info(disk)} for idx, disk in enumerate(disks)]
                 if self.args.json:
-                    print(json.dumps(disk_list, indent=2, default=str))
+                    print(_dumps(disk_list))
                 else:
                     for disk_info in disk_list:
                         print(f"Disk {disk_info['index']}: {disk_info['label']}")
@@ -983,24 +2447,9 @@ class VsphereMode:
                     disk = client.select_disk(vm, self.args.label_or_index)
                 except VMwareError as e:
                     raise Fatal(2, f"vsphere select_disk: {e}")
-                backing = disk.backing
-                output = {
-                    "label": disk.deviceInfo.label if hasattr(disk, "deviceInfo") else "disk",
-                    "key": disk.key,
-                    "capacity_gb": (
-                        disk.capacityInBytes / (1024**3)
-                        if hasattr(disk, "capacityInBytes")
-                        else disk.capacityInKB / 1024 / 1024
-                    ),
-                    "backing_file": backing.fileName if hasattr(backing, "fileName") else None,
-                    "mode": backing.mode if hasattr(backing, "mode") else None,
-                    "thinProvisioned": backing.thinProvisioned if hasattr(backing, "thinProvisioned") else None,
-                    "diskType": type(backing).__name__,
-                    "controllerKey": disk.controllerKey,
-                    "unitNumber": disk.unitNumber,
-                }
+                output = _disk_info(disk)
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
                     print(f"Selected Disk: {output['label']}")
                     print(f" Key: {output['key']}")
@@ -1012,7 +2461,7 @@ class VsphereMode:
                     raise Fatal(2, "vsphere download_datastore_file: --datastore, --ds-path, --local-path are required")
                 local_path = Path(self.args.local_path).resolve()
                 dc_name = self._dc_name()
-                chunk_size = int(getattr(self.args, "chunk_size", _DEFAULT_CHUNK_SIZE))
+                chunk_size = self._chunk_size()
                 try:
                     t0 = time.monotonic()
                     self._download_one_file_prefer_vddk(
@@ -1026,7 +2475,7 @@ class VsphereMode:
                         on_bytes=None,
                         chunk_size=chunk_size,
                     )
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: download_datastore_file took {_fmt_duration(time.monotonic()-t0)}")
                 except VMwareError as e:
                     raise Fatal(2, f"vsphere download_datastore_file: {e}")
@@ -1041,7 +2490,7 @@ class VsphereMode:
                     else "https",
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2))
+                    print(_dumps(output))
                 else:
                     print(f"Downloaded [{self.args.datastore}] {self.args.ds_path} to {local_path}")
                 return 0
@@ -1070,7 +2519,7 @@ class VsphereMode:
                     "vm_name": self.args.vm_name,
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
                     print(f"Snapshot created: {snap.name}")
                 return 0
@@ -1092,7 +2541,7 @@ class VsphereMode:
                     "now_enabled": now_enabled,
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
                     if now_enabled:
                         print("CBT enabled on VM" if not was_enabled else "CBT was already enabled on VM")
@@ -1103,14 +2552,7 @@ class VsphereMode:
                 vm = client.get_vm_by_name(self.args.vm_name)
                 if not vm:
                     raise Fatal(2, f"vsphere: VM not found: {self.args.vm_name}")
-                snapshots = []
-                if vm.snapshot:
-                    def traverse(snap_list):
-                        for snap in snap_list:
-                            snapshots.append(snap)
-                            traverse(snap.childSnapshotList)
-                    traverse(vm.snapshot.rootSnapshotList)
-                snap_info = next((s for s in snapshots if s.name == self.args.snapshot_name), None)
+                snap_info = self._snapshot_by_name(vm, self.args.snapshot_name)
                 if not snap_info:
                     raise Fatal(2, f"Snapshot not found: {self.args.snapshot_name}")
                 snapshot = snap_info.snapshot
@@ -1132,7 +2574,9 @@ class VsphereMode:
                     )
                 except Exception as e:
                     raise Fatal(2, f"vsphere query_changed_disk_areas: Failed to query changed areas: {e}")
-                changed_areas = [{"start": a.start, "length": a.length} for a in changed.changedDiskAreas]
+                # Keep the pyvmomi extents; _extent_json renders each one during encoding, so no
+                # per-extent dict list is materialized up front.
+                changed_areas = list(changed.changedDiskAreas or [])
                 output = {
                     "startOffset": changed.startOffset,
                     "length": changed.length,
@@ -1142,9 +2586,9 @@ class VsphereMode:
                     "device_key": device_key,
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output, default=_extent_json))
                 else:
-                    print(json.dumps(changed_areas, indent=2))
+                    print(_dumps(changed_areas, default=_extent_json))
                 return 0
             if action == "download_vm_disk":
                 if not all([self.args.vm_name, self.args.local_path]):
@@ -1166,8 +2610,8 @@ class VsphereMode:
                     raise Fatal(2, f"vsphere download_vm_disk: Failed to parse backing filename: {e}")
                 local_path = Path(self.args.local_path).resolve()
                 dc_name = self._dc_name()
-                chunk_size = int(getattr(self.args, "chunk_size", _DEFAULT_CHUNK_SIZE))
-                if self._debug_enabled():
+                chunk_size = self._chunk_size(DISK_CHUNK_SIZE)
+                if self._debug:
                     self.logger.debug(
                         f"vsphere: download_vm_disk vm={self.args.vm_name!r} disk_key={disk.key} "
                         f"backing={file_name!r} parsed_ds=[{datastore}] ds_path={ds_path!r} -> {str(local_path)!r}"
@@ -1185,7 +2629,7 @@ class VsphereMode:
                         on_bytes=None,
                         chunk_size=chunk_size,
                     )
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(f"vsphere: download_vm_disk took {_fmt_duration(time.monotonic()-t0)}")
                 except VMwareError as e:
                     raise Fatal(2, f"vsphere download_vm_disk: {e}")
@@ -1202,11 +2646,11 @@ class VsphereMode:
                     else "https",
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2))
+                    print(_dumps(output))
                 else:
                     print(f"Downloaded disk from VM {self.args.vm_name} to {local_path}")
                 return 0
-            # ✅ download-only VM folder pull (SYNC only; still uses Rich progress when available)
+            # ✅ download-only VM folder pull (vs_concurrency files in flight; still uses Rich progress when available)
             if action == "download_only_vm":
                 if not getattr(self.args, "vm_name", None):
                     raise Fatal(2, "vsphere download_only_vm: --vm_name is required")
@@ -1215,19 +2659,18 @@ class VsphereMode:
                     raise Fatal(2, f"vsphere: VM not found: {self.args.vm_name}")
                 out_dir = Path(self.args.output_dir).expanduser().resolve()
                 out_dir.mkdir(parents=True, exist_ok=True)
+                # Resolve per-action invariants once (used by logging, jobs and the output dict)
+                dc_name = self._dc_name()
+                prefer_govc = self._prefer_govmomi()
+                transport_pref = self._transport_preference()
                 include_glob = list(getattr(self.args, "vs_include_glob", None) or ["*"])
                 exclude_glob = list(getattr(self.args, "vs_exclude_glob", None) or [])
                 concurrency = int(getattr(self.args, "vs_concurrency", 4) or 4)
                 max_files = int(getattr(self.args, "vs_max_files", 5000) or 5000)
                 fail_on_missing = bool(getattr(self.args, "vs_fail_on_missing", False))
-                # You asked: no threads/async. We keep the knob for config compatibility,
-                # but force sync execution.
-                if concurrency != 1:
-                    try:
-                        self.logger.debug(f"download_only_vm: forcing sync mode (ignoring vs_concurrency={concurrency})")
-                    except Exception:
-                        pass
-                    concurrency = 1
+                # Files download in parallel over the shared keep-alive session; more workers
+                # than pooled connections would only open (and discard) extra TLS connections.
+                concurrency = max(1, min(concurrency, _HTTP_POOL_MAXSIZE))
                 vmx_path = None
                 try:
                     vmx_path = vm.summary.config.vmPathName if vm.summary and vm.summary.config else None
@@ -1238,16 +2681,16 @@ class VsphereMode:
                         2,
                         "vsphere download_only_vm: cannot determine VM folder (vm.summary.config.vmPathName missing)",
                     )
-                ds_name, folder = self._parse_vm_datastore_dir(str(vmx_path))
+                ds_name, folder = VsphereMode._parse_vm_datastore_dir(str(vmx_path))
                 # ✅ YAML/CLI override: force datastore folder even if summary lies
                 override = getattr(self.args, "vs_datastore_dir", None)
                 if override:
                     try:
-                        ds_name, folder = self._parse_datastore_dir_override(str(override), default_ds=ds_name)
+                        ds_name, folder = VsphereMode._parse_datastore_dir_override(str(override), default_ds=ds_name)
                         self.logger.info(f"download_only_vm: using vs_datastore_dir override: [{ds_name}] {folder or '.'}")
                     except Exception as e:
                         raise Fatal(2, f"vsphere download_only_vm: invalid vs_datastore_dir={override!r}: {e}")
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(
                         f"download_only_vm: vm={self.args.vm_name!r} vmx_path={str(vmx_path)!r} "
                         f"resolved=[{ds_name}] {folder or '.'} out_dir={str(out_dir)!r} "
@@ -1262,6 +2705,8 @@ class VsphereMode:
                     include_glob=include_glob,
                     exclude_glob=exclude_glob,
                     max_files=max_files,
+                    include_re=compile_globs(include_glob),
+                    exclude_re=compile_globs(exclude_glob),
                 )
                 if not files:
                     output = {
@@ -1274,21 +2719,21 @@ class VsphereMode:
                         "output_dir": str(out_dir),
                         "include_glob": include_glob,
                         "exclude_glob": exclude_glob,
-                        "used_govmomi": self._prefer_govmomi(),
-                        "transport_pref": self._transport_preference(),
+                        "used_govmomi": prefer_govc,
+                        "transport_pref": transport_pref,
                     }
                     if self.args.json:
-                        print(json.dumps(output, indent=2, default=str))
+                        print(_dumps(output))
                     else:
                         print("No files matched; nothing downloaded.")
                     return 0
                 self.logger.info(
                     f"download_only_vm: matched {len(files)} files in [{ds_name}] {folder or '.'} "
-                    f"(listing={'govc' if self._prefer_govmomi() else 'pyvmomi'})"
+                    f"(listing={'govc' if prefer_govc else 'pyvmomi'})"
                 )
                 verify_tls = not client.insecure
-                dc_name = self._dc_name()
                 downloaded: List[str] = []
+                skipped: List[str] = []
                 errors: List[str] = []
                 # Progress UI (TTY-only, and suppressed in --json mode to avoid corrupting JSON output)
                 progress = None
@@ -1310,18 +2755,70 @@ class VsphereMode:
                         progress = None
                         files_task = None
                         bytes_task = None
-                def _job(ds_path: str) -> None:
-                    local_path = out_dir / ds_path
-                    def _on_bytes(n: int, total: int) -> None:
-                        if progress is None:
+                # Byte progress: one counter per file (single writer each, no lock on the download path,
+                # even with parallel workers);
+                # a ~10 Hz refresher thread sums them into the Rich bar.
+                # The files bar is driven from the same thread: jobs only append to downloaded/skipped and
+                # overwrite a single label slot, so many small files don't cost Rich updates (lock +
+                # task lookup) each.
+                file_bytes: Dict[str, int] = dict.fromkeys(files, 0)
+                label: List[str] = ["files"]
+                stop_refresh = threading.Event()
+                def _refresh_bytes() -> None:
+                    shown = None
+                    shown_n = 0
+                    while True:
+                        stopping = stop_refresh.wait(_PROGRESS_REFRESH_S)
+                        try:
+                            progress.update(bytes_task, completed=sum(file_bytes.values()))
+                            if files_task is not None:
+                                finished = len(downloaded) + len(skipped)
+                                if label[0] is not shown or finished != shown_n:
+                                    shown, shown_n = label[0], finished
+                                    progress.update(files_task, description=shown, completed=finished)
+                        except Exception:
+                            pass
+                        if stopping:
                             return
-                        if bytes_task is not None:
-                            progress.advance(bytes_task, n)
-                        if files_task is not None:
-                            progress.update(files_task, description=f"downloading: {ds_path}")
+                refresher = None
+                if progress is not None and bytes_task is not None:
+                    refresher = threading.Thread(target=_refresh_bytes, name="vsphere-progress", daemon=True)
+                # Per-file invariants are bound once as keyword defaults (fast locals in _job);
+                # without a progress UI there is no byte callback at all.
+                show_files = progress is not None and files_task is not None
+                def _job(
+                    ds_path: str,
+                    *,
+                    _download: Any = self._download_one_file_prefer_vddk,
+                    _complete: Any = self._already_downloaded if self._resume_enabled() else None,
+                    _out: Path = out_dir,
+                    _chunk: int = self._chunk_size(),
+                    _show: bool = show_files,
+                    _track: bool = refresher is not None,
+                    _debug: bool = self._debug,
+                    _ok: Any = downloaded.append,
+                    _skip: Any = skipped.append,
+                    _err: Any = errors.append,
+                    _fail: bool = fail_on_missing,
+                ) -> None:
+                    local_path = _out / ds_path
+                    on_bytes = None
+                    if _track:
+                        def on_bytes(n: int, total: int) -> None:
+                            file_bytes[ds_path] += n
+                    if _show:
+                        label[0] = f"downloading: {ds_path}"
                     t0 = time.monotonic()
                     try:
-                        self._download_one_file_prefer_vddk(
+                        if _complete is not None and _complete(
+                            client, vc_host=vc_host, dc_name=dc_name, ds_name=ds_name,
+                            ds_path=ds_path, local_path=local_path, verify_tls=verify_tls,
+                        ):
+                            _skip(ds_path)
+                            if _debug:
+                                self.logger.debug(f"download_only_vm: skip ds_path={ds_path!r}: already complete locally")
+                            return
+                        _download(
                             client=client,
                             vc_host=vc_host,
                             dc_name=dc_name,
@@ -1329,13 +2826,11 @@ class VsphereMode:
                             ds_path=ds_path,
                             local_path=local_path,
                             verify_tls=verify_tls,
-                            on_bytes=_on_bytes,
-                            chunk_size=int(getattr(self.args, "chunk_size", _DEFAULT_CHUNK_SIZE)),
+                            on_bytes=on_bytes,
+                            chunk_size=_chunk,
                         )
-                        downloaded.append(ds_path)
-                        if progress is not None and files_task is not None:
-                            progress.advance(files_task, 1)
-                        if self._debug_enabled():
+                        _ok(ds_path)
+                        if _debug:
                             try:
                                 sz = local_path.stat().st_size
                             except Exception:
@@ -1345,24 +2840,44 @@ class VsphereMode:
                                 f"size={_fmt_bytes(sz)} dur={_fmt_duration(time.monotonic()-t0)}"
                             )
                     except Exception as e:
-                        msg = f"{ds_path}: {e}"
-                        errors.append(msg)
-                        if progress is not None and files_task is not None:
-                            progress.update(files_task, description=f"error: {ds_path}")
-                        if self._debug_enabled():
+                        _err(f"{ds_path}: {e}")
+                        if _show:
+                            label[0] = f"error: {ds_path}"
+                        if _debug:
                             self.logger.debug(
                                 f"download_only_vm: fail ds_path={ds_path!r} dur={_fmt_duration(time.monotonic()-t0)} err={_short_exc(e)}"
                             )
-                        if fail_on_missing:
+                        if _fail:
+                            raise
+                workers = min(concurrency, len(files))
+                def _run_all() -> None:
+                    if workers <= 1:
+                        for p in files:
+                            _job(p)
+                        return
+                    # _job records per-file errors itself; only fail_on_missing lets one escape,
+                    # in which case queued files are cancelled and the first error is re-raised.
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vsphere-dl") as ex:
+                        futs = [ex.submit(_job, p) for p in files]
+                        try:
+                            for fut in as_completed(futs):
+                                fut.result()
+                        except BaseException:
+                            for f in futs:
+                                f.cancel()
                             raise
-                def _run_all_sync() -> None:
-                    for p in files:
-                        _job(p)
                 if progress is not None:
                     with progress:
-                        _run_all_sync()
+                        if refresher is not None:
+                            refresher.start()
+                        try:
+                            _run_all()
+                        finally:
+                            if refresher is not None:
+                                stop_refresh.set()
+                                refresher.join()
                 else:
-                    _run_all_sync()
+                    _run_all()
                 output = {
                     "status": "success" if not errors else "partial",
                     "vm_name": self.args.vm_name,
@@ -1371,22 +2886,25 @@ class VsphereMode:
                     "output_dir": str(out_dir),
                     "matched": len(files),
                     "downloaded": len(downloaded),
+                    "skipped": len(skipped),
                     "errors": errors,
                     "include_glob": include_glob,
                     "exclude_glob": exclude_glob,
-                    "concurrency": 1, # forced sync
+                    "concurrency": workers,
                     "dc_name": dc_name,
                     "verify_tls": verify_tls,
-                    "used_govmomi": self._prefer_govmomi(),
-                    "govc_bin": self.govc.govc_bin if self._prefer_govmomi() else None,
+                    "used_govmomi": prefer_govc,
+                    "govc_bin": self.govc.govc_bin if prefer_govc else None,
                     "vs_datastore_dir": str(override) if override else None,
-                    "transport_pref": self._transport_preference(),
+                    "transport_pref": transport_pref,
                     "vddk_detected": self._client_has_vddk(client),
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
                     print(f"Downloaded {len(downloaded)}/{len(files)} files into {out_dir}")
+                    if skipped:
+                        print(f"Skipped {len(skipped)} file(s) already complete locally")
                     if errors:
                         print("Some downloads failed:")
                         for e in errors[:20]:
@@ -1413,6 +2931,7 @@ class VsphereMode:
                 except VMwareError as e:
                     raise Fatal(2, f"vsphere cbt_sync: Failed to parse backing filename: {e}")
                 local_disk = Path(self.args.local_path).resolve()
+                dc_name = self._dc_name()
                 if not local_disk.exists():
                     raise Fatal(2, f"vsphere: local disk file does not exist for cbt-sync: {local_disk}")
                 was_enabled = vm.config.changeTrackingEnabled if vm.config else False
@@ -1431,7 +2950,7 @@ class VsphereMode:
                 try:
                     device_key = disk.key
                     change_id = getattr(self.args, "change_id", None)
-                    if self._debug_enabled():
+                    if self._debug:
                         self.logger.debug(
                             f"cbt_sync: vm={self.args.vm_name!r} device_key={device_key} snapshot={snap_name!r} "
                             f"change_id={change_id!r} backing={file_name!r} ds=[{datastore}] ds_path={ds_path!r} local={str(local_disk)!r}"
@@ -1451,55 +2970,39 @@ class VsphereMode:
                         num_ranges = len(changed.changedDiskAreas)
                         if not REQUESTS_AVAILABLE:
                             raise Fatal(2, "requests not installed. Install: pip install requests")
-                        dc_name = self._dc_name()
                         quoted = quote(ds_path, safe="/")
                         url = f"https://{vc_host}/folder/{quoted}?dcPath={quote(dc_name)}&dsName={quote(datastore)}"
                         headers = {"Cookie": client._session_cookie()}
                         verify = not client.insecure
-                        total = sum(int(a.length) for a in changed.changedDiskAreas)
+                        total = sum(a.length for a in changed.changedDiskAreas) # pyvmomi longs are ints
                         done = 0
                         self.logger.info(f"Syncing {num_ranges} ranges ({total/(1024**2):.1f} MiB)")
-                        # Basic timeouts for CBT range reads
-                        timeout_tuple = _DEFAULT_HTTP_TIMEOUT
-                        with open(local_disk, "rb+") as f:
-                            for a in changed.changedDiskAreas:
-                                start = int(a.start)
-                                length = int(a.length)
-                                end = start + length - 1
-                                h = dict(headers)
-                                h["Range"] = f"bytes={start}-{end}"
-                                t0 = time.monotonic()
-                                try:
-                                    r = requests.get(url, headers=h, verify=verify, timeout=timeout_tuple)
-                                    if int(getattr(r, "status_code", 0) or 0) >= 400:
-                                        r.raise_for_status()
-                                except requests.RequestException as e:
-                                    raise Fatal(2, f"vsphere cbt_sync: HTTP request failed: {e}")
-                                data = r.content
-                                if len(data) != length:
-                                    # Range responses can be shorter if server/proxy misbehaves
-                                    raise Fatal(
-                                        2,
-                                        f"vsphere cbt_sync: short read for range {start}-{end}: got={len(data)} expected={length}",
-                                    )
-                                f.seek(start)
-                                f.write(data)
-                                done += length
-                                if self._debug_enabled():
-                                    self.logger.debug(
-                                        f"CBT range {start}-{end} ({length} bytes) ok in {_fmt_duration(time.monotonic()-t0)}"
-                                    )
-                                if total:
-                                    self.logger.debug(
-                                        f"CBT sync: {done/(1024**2):.1f} MiB / {total/(1024**2):.1f} MiB ({(done/total)*100:.1f}%)"
-                                    )
+                        done = self._cbt_sync_ranges(
+                            url=url,
+                            headers=headers,
+                            verify=verify,
+                            local_disk=local_disk,
+                            areas=changed.changedDiskAreas,
+                            total=total,
+                        )
                     self.logger.info("CBT sync completed")
                 except Exception as e:
                     raise Fatal(2, f"vsphere cbt_sync: Failed during sync: {e}")
                 finally:
+                    # Removal (consolidation) can take a while; vs_wait_snapshot_remove=0 /
+                    # VMDK2KVM_VSPHERE_WAIT_SNAPSHOT_REMOVE=0 leaves the task running on vCenter.
+                    wait_remove = _boolish(
+                        self._knob("vs_wait_snapshot_remove", "VMDK2KVM_VSPHERE_WAIT_SNAPSHOT_REMOVE", "1")
+                    )
+                    snapshot_removal = "failed"
                     try:
                         task = snap.RemoveSnapshot_Task(removeChildren=False)
-                        client.wait_for_task(task)
+                        if wait_remove:
+                            client.wait_for_task(task)
+                            snapshot_removal = "done"
+                        else:
+                            snapshot_removal = f"pending ({task._moId})"
+                            self.logger.info(f"Snapshot removal left running on vCenter: task {task._moId}")
                     except Exception as e:
                         self.logger.warning(f"Failed to remove snapshot: {e}")
                 output = {
@@ -1511,19 +3014,21 @@ class VsphereMode:
                     "cbt_was_enabled": was_enabled,
                     "cbt_now_enabled": vm.config.changeTrackingEnabled if vm.config else False,
                     "snapshot_name": snap_name,
-                    "dc_name": self._dc_name(),
+                    "snapshot_removal": snapshot_removal,
+                    "dc_name": dc_name,
                 }
                 if self.args.json:
-                    print(json.dumps(output, indent=2, default=str))
+                    print(_dumps(output))
                 else:
                     print(f"CBT sync completed: synced {done} bytes in {num_ranges} ranges")
                 return 0
             raise Fatal(2, f"vsphere: unknown action: {action}")
         finally:
+            self._close_http()
             try:
                 t0 = time.monotonic()
                 client.disconnect()
-                if self._debug_enabled():
+                if self._debug:
                     self.logger.debug(f"vsphere: disconnected in {_fmt_duration(time.monotonic()-t0)}")
             except Exception as e:
                 self.logger.warning(f"Failed to disconnect: {e}")
\ No newline at end of file